@@ -0,0 +1,102 @@
+import operator
+import time
+from collections import namedtuple
+import numpy as np
+
+ALERT_METRICS = ['cpu', 'memory', 'bandwidth', 'latency', 'packet_loss', 'errors', 'up']
+
+# clear_threshold gives hysteresis: an active alert only clears once the metric is back past it.
+# hold is how many seconds the condition must persist before the alert is raised.
+AlertRule = namedtuple('AlertRule', 'type metric operator threshold clear_threshold severity hold message')
+
+DEFAULT_RULES = [
+    AlertRule('high_cpu', 'cpu', '>', 90, 85, 'critical', 6, 'CPU usage critical ({value:.1f}%)'),
+    AlertRule('high_memory', 'memory', '>', 95, 90, 'warning', 6, 'Memory usage high ({value:.1f}%)'),
+    AlertRule('high_latency', 'latency', '>', 100, 90, 'warning', 6, 'High latency detected ({value:.1f}ms)'),
+    AlertRule('packet_loss', 'packet_loss', '>', 5, 3, 'warning', 6, 'Packet loss detected ({value:.1f}%)'),
+    AlertRule('device_down', 'up', '<', 0.5, 0.5, 'critical', 0, 'Device {device} is offline'),
+]
+
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+
+
+class AlertEngine:
+    """Evaluates a rule table over the whole device x metric matrix and tracks alert state"""
+    def __init__(self, rules=DEFAULT_RULES, metrics=ALERT_METRICS):
+        self.rules = list(rules)
+        self.metrics = list(metrics)
+        self.columns = np.array([self.metrics.index(r.metric) for r in self.rules])
+        self.thresholds = np.array([r.threshold for r in self.rules], dtype=float)
+        self.clear_thresholds = np.array([r.clear_threshold for r in self.rules], dtype=float)
+        self.holds = np.array([r.hold for r in self.rules], dtype=float)
+        self.operators = [(OPERATORS[op], np.array([r.operator == op for r in self.rules]))
+                          for op in OPERATORS]
+
+        self.device_names = []
+        self.active = np.zeros((0, len(self.rules)), dtype=bool)
+        self.pending_since = np.zeros((0, len(self.rules)))
+        self.active_alerts = {}
+
+    def _compare(self, values, thresholds):
+        result = np.zeros(values.shape, dtype=bool)
+        for op, columns in self.operators:
+            if columns.any():
+                result[:, columns] = op(values[:, columns], thresholds[columns])
+        return result
+
+    def _align(self, device_names):
+        """Carry per-device state over to the current device order; vanished devices clear"""
+        rows = {name: i for i, name in enumerate(self.device_names)}
+        old = np.array([rows.get(name, -1) for name in device_names], dtype=np.intp)
+        known = old >= 0
+        active = np.zeros((len(device_names), len(self.rules)), dtype=bool)
+        pending = np.full((len(device_names), len(self.rules)), np.nan)
+        active[known] = self.active[old[known]]
+        pending[known] = self.pending_since[old[known]]
+
+        kept = set(device_names)
+        cleared = [key for key, alert in self.active_alerts.items() if alert.get('device') not in kept]
+        self.device_names, self.active, self.pending_since = list(device_names), active, pending
+        return cleared
+
+    def evaluate(self, device_names, matrix, now=None):
+        """Evaluate one tick; returns (raised alerts, cleared alert keys)"""
+        now = time.time() if now is None else now
+        cleared = self._align(device_names)
+
+        values = np.asarray(matrix, dtype=float)[:, self.columns]
+        known = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            triggered = self._compare(values, self.thresholds) & known
+            holding = self._compare(values, self.clear_thresholds) | ~known
+
+        # Hold-down: remember when each condition started, forget it once it stops;
+        # devices not sampled this tick keep their state
+        started = np.where(triggered, np.fmin(self.pending_since, now), np.nan)
+        self.pending_since = np.where(known, started, self.pending_since)
+        raise_mask = ~self.active & triggered & (now - self.pending_since >= self.holds)
+        clear_mask = self.active & ~holding
+        self.active = (self.active | raise_mask) & ~clear_mask
+
+        raised = []
+        for row, rule_index in zip(*np.nonzero(raise_mask)):
+            rule = self.rules[rule_index]
+            device = self.device_names[row]
+            alert = {
+                'type': rule.type,
+                'message': rule.message.format(value=values[row, rule_index], device=device),
+                'severity': rule.severity,
+                'device': device,
+                'since': now
+            }
+            self.active_alerts[self._key(rule.type, device)] = alert
+            raised.append(alert)
+        for row, rule_index in zip(*np.nonzero(clear_mask)):
+            cleared.append(self._key(self.rules[rule_index].type, self.device_names[row]))
+        for key in cleared:
+            self.active_alerts.pop(key, None)
+        return raised, cleared
+
+    @staticmethod
+    def _key(alert_type, device):
+        return f"{alert_type}:{device}"
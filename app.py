@@ -1,175 +1,608 @@
-import requests
-from flask import Flask, render_template, request, jsonify
-from flask_socketio import SocketIO
-from joblib import load
-import numpy as np
-import time
-import threading
-import logging
-from datetime import datetime
-
-# Initialize Flask
-app = Flask(__name__)
-socketio = SocketIO(app)
-
-# Configuration
-GNS3_SERVER = "http://localhost:3080"
-ACTIVE_PROJECT = None
-current_devices = []
-
-# Load AI Model
-try:
-    model_data = load('model/network_ai.joblib')
-    print("AI model loaded successfully!")
-except Exception as e:
-    print(f"Error loading model: {str(e)}")
-    model_data = None
-
-# Alert System
-class AlertSystem:
-    def __init__(self):
-        self.active_alerts = []
-    
-    def check_alerts(self, stats):
-        alerts = []
-        
-        # High CPU
-        if stats['cpu'] > 90:
-            alerts.append({
-                'type': 'high_cpu',
-                'message': f'CPU usage critical ({stats["cpu"]:.1f}%)',
-                'severity': 'critical'
-            })
-        
-        # High Latency
-        if stats['latency'] > 100:
-            alerts.append({
-                'type': 'high_latency',
-                'message': f'High latency detected ({stats["latency"]:.1f}ms)',
-                'severity': 'warning'
-            })
-        
-        # Device Down
-        for device in stats.get('devices', []):
-            if device['status'] != 'started':
-                alerts.append({
-                    'type': 'device_down',
-                    'message': f'Device {device["name"]} is offline',
-                    'severity': 'critical',
-                    'device': device['name']
-                })
-        
-        return alerts
-    
-    def remediate(self, alert_type, device_name=None):
-        if alert_type == 'high_cpu':
-            return self._balance_load()
-        elif alert_type == 'high_latency':
-            return self._reroute_traffic()
-        elif alert_type == 'device_down':
-            return self._restart_device(device_name)
-        return {"status": "no_action_available"}
-    
-    def _balance_load(self):
-        print("Executing CPU load balancing...")
-        return {"action": "load_balancing", "status": "initiated"}
-    
-    def _reroute_traffic(self):
-        print("Rerouting network traffic...")
-        return {"action": "traffic_reroute", "status": "initiated"}
-    
-    def _restart_device(self, device_name):
-        print(f"Attempting to restart {device_name}...")
-        return {"action": "device_restart", "device": device_name, "status": "attempted"}
-
-alert_system = AlertSystem()
-
-# GNS3 Project Management
-@app.route('/get_projects', methods=['GET'])
-def get_projects():
-    try:
-        response = requests.get(f"{GNS3_SERVER}/v2/projects")
-        projects = [{"name": p["name"], "id": p["project_id"]} for p in response.json()]
-        return jsonify({"success": True, "projects": projects})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
-
-@app.route('/set_project', methods=['POST'])
-def set_project():
-    global ACTIVE_PROJECT, current_devices
-    ACTIVE_PROJECT = request.json.get('project_id')
-    current_devices = []
-    return jsonify({"success": True})
-
-@app.route('/remediate', methods=['POST'])
-def handle_remediate():
-    data = request.json
-    result = alert_system.remediate(data['alert_type'], data.get('device'))
-    return jsonify({"success": True, "result": result})
-
-# Monitoring Thread
-def background_monitor():
-    global current_devices
-    
-    while True:
-        if not ACTIVE_PROJECT:
-            time.sleep(3)
-            continue
-            
-        try:
-            # Get project nodes
-            response = requests.get(f"{GNS3_SERVER}/v2/projects/{ACTIVE_PROJECT}/nodes")
-            nodes = response.json()
-            current_devices = [{"name": n["name"], "status": n["status"]} for n in nodes]
-            
-            # Generate simulated metrics
-            stats = {
-                'cpu': np.random.uniform(0, 100),
-                'memory': np.random.uniform(0, 100),
-                'latency': np.random.uniform(1, 200),
-                'packet_loss': np.random.uniform(0, 10),
-                'errors': np.random.randint(0, 20),
-                'devices': current_devices,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # AI Prediction
-            if model_data:
-                try:
-                    scaled = model_data['scaler'].transform([[
-                        stats['cpu'],
-                        stats['memory'],
-                        500,  # Placeholder bandwidth
-                        stats['latency'],
-                        stats['packet_loss'],
-                        stats['errors']
-                    ]])
-                    pred = model_data['model'].predict(scaled)
-                    stats['status'] = model_data['classes'][np.argmax(pred)]
-                except Exception as e:
-                    print(f"Prediction error: {str(e)}")
-                    stats['status'] = 'error'
-            
-            # Check alerts
-            stats['alerts'] = alert_system.check_alerts(stats)
-            
-            socketio.emit('update', stats)
-            
-        except Exception as e:
-            print(f"Monitoring error: {str(e)}")
-        
-        time.sleep(3)
-
-# Routes
-@app.route('/')
-def dashboard():
-    return render_template('index.html')
-
-@socketio.on('connect')
-def handle_connect():
-    thread = threading.Thread(target=background_monitor)
-    thread.daemon = True
-    thread.start()
-
-if __name__ == '__main__':
+# Socket.IO serves on eventlet; patch blocking I/O, sleeps and threads into green
+# equivalents before anything else is imported, so GNS3 calls, collector reads and
+# worker pools yield to the hub instead of freezing every handler while they wait.
+# Importers (benchmark.py, tests) don't run the server and must not be patched mid-run
+if __name__ == '__main__':
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, render_template, request, jsonify
+from flask_socketio import SocketIO, join_room, leave_room
+import numpy as np
+import itertools
+import os
+import queue
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from alert_rules import AlertEngine, DEFAULT_RULES
+from collectors import CollectorPool, get_collector
+from dataset_schema import CLASSES
+from drift import DriftMonitor, REFERENCES as DRIFT_REFERENCES
+from gns3_client import GNS3Client
+from history import DeviceQuota, MetricHistory, HISTORY_METRICS
+from instrumentation import MetricsRegistry, SamplingProfiler
+from model_registry import ModelRegistry, top_confidence
+from prediction_cache import PredictionCache
+from remediation import RemediationQueue
+from scheduler import PollBudget, PollScheduler
+from stream import StreamHub
+from topology import TopologyIndex
+
+# Initialize Flask
+app = Flask(__name__)
+socketio = SocketIO(app)
+
+# Configuration
+GNS3_SERVER = "http://localhost:3080"
+gns3 = GNS3Client(GNS3_SERVER)  # Shared keep-alive pool and metadata cache
+ACTIVE_PROJECT = None  # Project new dashboards open on; any number can be watched
+MONITOR_INTERVAL = 3
+MONITOR_WORKERS = 8  # Projects whose nodes are fetched concurrently each tick
+
+# One shared monitor loop for every watched project, fanned out to a Socket.IO room per project
+monitors = {}  # project id -> ProjectMonitor
+monitor_task = None
+tick_counter = itertools.count()  # Rotates which project picks from the poll budget first
+viewers = {}  # Socket.IO sid -> project id room
+monitor_lock = threading.Lock()
+
+# Snapshot-then-delta update stream with per-client backpressure. Dashboards
+# acknowledge each 'snapshot'/'delta' event; until they do, newer deltas are
+# coalesced instead of queued.
+def emit_to_client(event, payload, sid, callback):
+    socketio.emit(event, payload, to=sid, callback=callback)
+
+stream_hub = StreamHub(emit_to_client)
+poll_budget = PollBudget()  # MAX_POLLS_PER_SECOND across every watched project
+
+# Per-stage timings and counters for /metrics; the profiler only runs on request
+metrics = MetricsRegistry()
+profiler = SamplingProfiler()
+MAX_PROFILE_SECONDS = 60
+
+# Device metrics come from a pluggable collector ('http' reads an agent on each node),
+# read concurrently with a per-node timeout
+COLLECTOR = 'simulated'  # 'synthetic' draws realistic readings learned from the training CSV
+collector_pool = CollectorPool(get_collector(COLLECTOR))
+
+# Devices with steady readings skip inference; cleared whenever the registry swaps models
+prediction_cache = PredictionCache()
+metrics.gauge('model_loaded', 'Whether a validated model is serving predictions',
+              lambda: int(model_registry.current is not None))
+metrics.gauge('drifting_groups', 'Device groups whose features drifted from the training data',
+              lambda: sum(g['status'] == 'drift' for m in list(monitors.values()) for g in m.drift.scores().values()))
+metrics.gauge('prediction_cache_entries', 'Feature buckets held in the prediction cache',
+              lambda: len(prediction_cache.entries))
+
+# Bounded per-device metric history and alert state, one of each per project
+histories = {}
+# Device rows shared by every project's history, so memory stays bounded however many are watched
+history_quota = DeviceQuota()
+project_alerts = {}
+topologies = {}  # project id -> (node and link ids, TopologyIndex)
+TOPOLOGY_FILE = 'topology.json'  # Saved by create_nw.py
+TRAINING_STORE = 'network_performance_dataset.store'  # Built by model.py; drift compares live traffic to it
+
+# AI model: found, validated and loaded in the background so the app serves immediately,
+# then hot-swapped whenever a newer artifact is saved (see model_registry.MODEL_DIRS)
+model_registry = ModelRegistry()
+# Training histograms for drift are built once per model, before it serves, and shared by all projects
+model_registry.listeners.append(lambda model_data: DRIFT_REFERENCES.build(model_data, TRAINING_STORE))
+model_registry.start()
+
+# Alert System
+class AlertSystem:
+    def __init__(self, rules=DEFAULT_RULES):
+        self.engine = AlertEngine(rules)
+        self.active_alerts = []
+    
+    def check_alerts(self, devices, features, topology=None):
+        """Evaluate the rule table over all devices at once; returns (raised, cleared)
+
+        With a topology, devices behind a failed switch are folded into the
+        switch's alert instead of being reported one by one.
+        """
+        up = np.array([d['status'] == 'started' for d in devices], dtype=float).reshape(-1, 1)
+        raised, cleared = self.engine.evaluate([d['name'] for d in devices], np.hstack([features, up]))
+        self.active_alerts = list(self.engine.active_alerts.values())
+        if topology is not None:
+            self.active_alerts = topology.collapse(self.active_alerts)
+            visible = {(a['type'], a.get('device')) for a in self.active_alerts}
+            raised = [a for a in raised if (a['type'], a['device']) in visible]
+        return raised, cleared
+    
+    def remediate(self, alert_type, device_name=None):
+        if alert_type == 'high_cpu':
+            return self._balance_load()
+        elif alert_type == 'high_latency':
+            return self._reroute_traffic()
+        elif alert_type == 'device_down':
+            return self._restart_device(device_name)
+        return {"status": "no_action_available"}
+    
+    def _balance_load(self):
+        print("Executing CPU load balancing...")
+        return {"action": "load_balancing", "status": "initiated"}
+    
+    def _reroute_traffic(self):
+        print("Rerouting network traffic...")
+        return {"action": "traffic_reroute", "status": "initiated"}
+    
+    def _restart_device(self, device_name):
+        print(f"Attempting to restart {device_name}...")
+        return {"action": "device_restart", "device": device_name, "status": "attempted"}
+
+alert_system = AlertSystem()
+
+# Remediation runs on its own worker pool and reports back over Socket.IO. Workers only
+# queue finished jobs; a task on the Socket.IO hub emits them, since emitting from
+# another OS thread isn't safe
+NOTIFY_INTERVAL = 0.2
+remediation_events = queue.Queue()
+notifier_task = None
+notifier_lock = threading.Lock()
+
+def notify_remediation(job):
+    remediation_events.put((job.project_id, job.to_dict()))
+
+def deliver_remediations():
+    while True:
+        while True:
+            try:
+                project_id, payload = remediation_events.get_nowait()
+            except queue.Empty:
+                break
+            if project_id:
+                socketio.emit('remediation_complete', payload, room=project_id)
+            else:
+                socketio.emit('remediation_complete', payload)
+        socketio.sleep(NOTIFY_INTERVAL)
+
+def start_notifier():
+    global notifier_task
+    with notifier_lock:
+        if notifier_task is None:
+            notifier_task = socketio.start_background_task(deliver_remediations)
+
+remediation_queue = RemediationQueue(alert_system.remediate, on_complete=notify_remediation)
+
+metrics.gauge('connected_clients', 'Connected dashboards', lambda: len(viewers))
+metrics.gauge('watched_projects', 'Projects in the monitor loop', lambda: len(monitors))
+metrics.gauge('remediation_queue_depth', 'Remediation jobs queued or running', remediation_queue.pending_count)
+metrics.gauge('stream_backlog', 'Dashboards with an update waiting on an acknowledgement', stream_hub.pending_count)
+
+# GNS3 Project Management
+@app.route('/get_projects', methods=['GET'])
+def get_projects():
+    try:
+        projects = [{"name": p["name"], "id": p["project_id"]} for p in gns3.projects()]
+        return jsonify({"success": True, "projects": projects})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route('/set_project', methods=['POST'])
+def set_project():
+    global ACTIVE_PROJECT
+    ACTIVE_PROJECT = request.json.get('project_id')
+    if ACTIVE_PROJECT:
+        watch_project(ACTIVE_PROJECT)
+        # Dashboards follow the active project to its room; other projects keep being watched
+        for sid in list(viewers):
+            move_viewer(sid, ACTIVE_PROJECT)
+    return jsonify({"success": True})
+
+@app.route('/watch_project', methods=['POST'])
+def handle_watch_project():
+    project_id = request.json.get('project_id')
+    if not project_id:
+        return jsonify({"success": False, "error": "project_id is required"})
+    watch_project(project_id)
+    return jsonify({"success": True, "watched": sorted(monitors)})
+
+@app.route('/unwatch_project', methods=['POST'])
+def handle_unwatch_project():
+    unwatch_project(request.json.get('project_id'))
+    return jsonify({"success": True, "watched": sorted(monitors)})
+
+@app.route('/watched_projects', methods=['GET'])
+def get_watched_projects():
+    projects = [{"id": m.project_id, "devices": len(m.devices), "alerts": len(m.alerts.active_alerts)}
+                for m in list(monitors.values())]
+    return jsonify({"success": True, "projects": projects})
+
+@app.route('/history', methods=['GET'])
+def get_history():
+    history = histories.get(request.args.get('project_id', ACTIVE_PROJECT))
+    if history is None:
+        return jsonify({"success": False, "error": "No history for this project"})
+    
+    end = request.args.get('end', type=float) or time.time()
+    start = request.args.get('start', type=float) or end - 3600
+    resolution = request.args.get('resolution', 'auto')
+    requested_metrics = request.args.get('metrics', ','.join(HISTORY_METRICS)).split(',')
+    if resolution not in ('auto',) + tuple(history.tiers) or not set(requested_metrics) <= set(HISTORY_METRICS):
+        return jsonify({"success": False, "error": "Unknown resolution or metric"})
+    
+    result = history.query(request.args.get('device'), start, end, resolution, requested_metrics)
+    if result is None:
+        return jsonify({"success": False, "error": "Unknown device"})
+    
+    # NaN marks ticks where the device wasn't sampled
+    series = {}
+    labels = np.array(CLASSES + [None], dtype=object)
+    for metric, values in result['metrics'].items():
+        missing = np.isnan(values)
+        if metric == 'prediction':
+            series[metric] = labels[np.where(missing, len(CLASSES), values).astype(int)].tolist()
+        else:
+            column = np.round(values.astype(np.float64), 3).astype(object)
+            column[missing] = None
+            series[metric] = column.tolist()
+    return jsonify({"success": True, "resolution": result['resolution'],
+                    "timestamps": result['timestamps'], "metrics": series})
+
+@app.route('/remediate', methods=['POST'])
+def handle_remediate():
+    data = request.json
+    start_notifier()
+    job = remediation_queue.submit(data['alert_type'], data.get('device'), data.get('project_id', ACTIVE_PROJECT))
+    if job.status == 'rate_limited':
+        return jsonify({"success": False, "error": "Too many remediations of this type", "job": job.to_dict()}), 429
+    return jsonify({"success": True, "job_id": job.id, "status": job.status}), 202
+
+@app.route('/drift', methods=['GET'])
+def get_drift():
+    """Drift scores of live features against the training data, per device group"""
+    monitor = monitors.get(request.args.get('project_id', ACTIVE_PROJECT))
+    if monitor is None:
+        return jsonify({"success": False, "error": "Project is not being monitored"})
+    return jsonify({"success": True, "groups": monitor.drift.scores(request.args.get('group'))})
+
+@app.route('/models', methods=['GET'])
+def get_models():
+    return jsonify({"success": True, **model_registry.describe()})
+
+@app.route('/models/reload', methods=['POST'])
+def reload_models():
+    """Rescan for artifacts, or pin one with {"path": ...}; loading happens in the background"""
+    model_registry.activate((request.json or {}).get('path'))
+    return jsonify({"success": True, "status": model_registry.status}), 202
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/profile', methods=['GET'])
+def get_profile():
+    """Sample every thread for a few seconds and return collapsed stacks for a flamegraph"""
+    seconds = min(request.args.get('seconds', 10, type=float), MAX_PROFILE_SECONDS)
+    if profiler.running:
+        return jsonify({"success": False, "error": "A profile is already being taken"}), 409
+    profiler.start()
+    try:
+        socketio.sleep(seconds)
+    finally:
+        profiler.stop()
+    return Response(profiler.collapsed(request.args.get('limit', type=int)), mimetype='text/plain')
+
+@app.route('/remediation/<job_id>', methods=['GET'])
+def get_remediation(job_id):
+    job = remediation_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job"}), 404
+    return jsonify({"success": True, "job": job.to_dict()})
+
+# Per-device scoring
+FEATURE_NAMES = ['cpu', 'memory', 'bandwidth', 'latency', 'packet_loss', 'errors']
+
+def score_devices(features, model_data):
+    """Labels and confidence per device; repeated quantized readings are served from the cache"""
+    hits, misses = prediction_cache.hits, prediction_cache.misses
+    labels, confidence = prediction_cache.predict(features, lambda X: run_model(model_data, X), model=model_data)
+    metrics.inc('prediction_cache_hits_total', prediction_cache.hits - hits, help='Predictions served from the cache')
+    metrics.inc('prediction_cache_misses_total', prediction_cache.misses - misses, help='Feature buckets sent to the model')
+    return labels, confidence
+
+def run_model(model_data, features):
+    """Run the scaler and model once over the whole device matrix; returns (labels, confidence)"""
+    with metrics.time('scaler_transform'):
+        scaled = model_data['scaler'].transform(features)
+    with metrics.time('model_predict'):
+        pred = model_data['model'].predict(scaled, batch_size=max(len(scaled), 1), verbose=0)
+    return np.asarray(model_data['classes'])[np.argmax(pred, axis=1)], top_confidence(pred)
+
+def topology_for(project_id, nodes):
+    """Project hierarchy from GNS3 links, rebuilt only when the nodes or links change"""
+    try:
+        links = gns3.links(project_id)
+    except Exception as e:
+        # Fall back to the hierarchy saved by the network builder
+        if project_id not in topologies and os.path.exists(TOPOLOGY_FILE):
+            topologies[project_id] = (None, TopologyIndex.load(TOPOLOGY_FILE))
+        print(f"Topology error: {str(e)}")
+        return topologies.get(project_id, (None, None))[1]
+    # Rewiring replaces links, so their ids change even when the counts don't
+    signature = (frozenset((n["node_id"], n["name"]) for n in nodes), frozenset(l["link_id"] for l in links))
+    cached = topologies.get(project_id)
+    if cached is None or cached[0] != signature:
+        cached = topologies[project_id] = (signature, TopologyIndex.from_gns3(nodes, links))
+    return cached[1]
+
+# Monitoring
+class ProjectMonitor:
+    """Polling, history and alert state of one watched project"""
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.history = histories.setdefault(project_id, MetricHistory(quota=history_quota))
+        self.alerts = project_alerts.setdefault(project_id, AlertSystem())
+        self.drift = DriftMonitor(TRAINING_STORE)
+        # Each device is polled on its own interval: quickly while it looks unhealthy,
+        # backing off while it stays healthy, within the poll budget shared by all projects
+        self.scheduler = PollScheduler(budget=poll_budget)
+        self.latest = {}  # device -> (last metrics row, last prediction)
+        self.devices = []
+        self.nodes = []
+        self.topology = None
+        self.polled = []
+        self.picked = []
+        self.features = np.empty((0, len(FEATURE_NAMES)))
+
+    def fetch(self, now):
+        """Refresh node status and topology and track the project's current devices"""
+        # Node status is refreshed for every device each tick
+        with metrics.time('gns3_fetch'):
+            self.nodes = gns3.nodes(self.project_id)
+            self.topology = topology_for(self.project_id, self.nodes)
+        self.polled = []
+        self.picked = []
+        self.scheduler.sync([n["name"] for n in self.nodes], now)
+
+    def pick(self, now, limit=None):
+        """Take up to limit of the devices due this tick from the scheduler"""
+        self.picked = self.scheduler.due(now, limit)
+
+    def collect(self, now):
+        """Sample the picked devices, all at once; the round waits for the slowest one at most"""
+        due = self.picked
+        try:
+            with metrics.time('collect_metrics'):
+                by_name = {n["name"]: n for n in self.nodes}
+                features, status = collector_pool.collect([by_name[name] for name in due])
+        except Exception:
+            for name in due:
+                self.scheduler.retry(name, now)
+            raise
+        complete = ~np.isnan(features).any(axis=1)
+        self.polled = [name for name, ok in zip(due, complete) if ok]
+        self.features = features[complete]
+        # Devices without a full reading keep their last values and are retried soon
+        for name, ok in zip(due, complete):
+            if not ok:
+                self.scheduler.retry(name, now)
+                metrics.inc('collection_failures_total', help='Device reads that timed out or failed',
+                            reason='timeout' if status[name] == 'timeout' else 'error')
+
+    def apply(self, now, predictions, confidence, scored=True, model_data=None):
+        """Fold this tick's predictions into the project state, history and alerts"""
+        try:
+            self._apply(now, predictions, confidence, scored, model_data)
+        finally:
+            # Devices the tick failed to reschedule are retried rather than dropped
+            for name in self.polled:
+                if self.scheduler.due_at.get(name, 0) is None:
+                    self.scheduler.retry(name, now)
+
+    def _apply(self, now, predictions, confidence, scored, model_data):
+        polled, features, nodes = self.polled, self.features, self.nodes
+        with metrics.time('feature_assembly'):
+            names = [n["name"] for n in nodes]
+            for name, row, prediction in zip(polled, features, predictions):
+                self.latest[name] = (row, prediction)
+            for name in set(self.latest) - set(names):
+                del self.latest[name]
+            
+            # Last known values for every device; only polled rows are fresh this tick
+            known = np.full((len(nodes), len(FEATURE_NAMES)), np.nan)
+            fresh = np.full((len(nodes), len(FEATURE_NAMES)), np.nan)
+            rows = {name: i for i, name in enumerate(names)}
+            devices = []
+            for i, n in enumerate(nodes):
+                device = {"name": n["name"], "status": n["status"]}
+                if n["name"] in self.latest:
+                    row, prediction = self.latest[n["name"]]
+                    known[i] = row
+                    device.update(zip(FEATURE_NAMES, row.tolist()))
+                    if prediction is not None:
+                        device['prediction'] = prediction
+                device['poll_interval'] = self.scheduler.interval[n["name"]]
+                devices.append(device)
+            for name, row in zip(polled, features):
+                fresh[rows[name]] = row
+            self.devices = devices
+        
+        # Project-wide averages for the summary view
+        sampled = known[~np.isnan(known[:, 0])]
+        means = sampled.mean(axis=0) if len(sampled) else np.zeros(len(FEATURE_NAMES))
+        stats = dict(zip(FEATURE_NAMES, means.tolist()))
+        stats['devices'] = devices
+        stats['timestamp'] = datetime.now().isoformat()
+        stats['polled'] = len(polled)
+        current = [d['prediction'] for d in devices if 'prediction' in d]
+        if current:
+            labels, counts = np.unique(current, return_counts=True)
+            stats['status'] = str(labels[np.argmax(counts)])
+        elif not scored:
+            stats['status'] = 'error'
+        
+        # Keep the polled samples in the per-device history
+        class_codes = {label: i for i, label in enumerate(CLASSES)}
+        codes = np.array([[class_codes.get(p, np.nan)] for p in predictions]).reshape(-1, 1)
+        if polled:
+            with metrics.time('history'):
+                self.history.record(now, polled, np.hstack([features, codes]))
+        
+        # Compare the fresh readings with the data the serving model was trained on
+        if polled:
+            with metrics.time('drift'):
+                types = {n["name"]: n.get("node_type", "unknown") for n in nodes}
+                self.drift.update(features, [types[name] for name in polled], model_data)
+        
+        # Check alerts; devices not polled this tick keep their alert state.
+        # The stream sends clients only what was raised or cleared
+        with metrics.time('alert_evaluation'):
+            self.alerts.check_alerts(devices, fresh, self.topology)
+        stats['alerts'] = self.alerts.active_alerts
+        
+        alerting = {a['device'] for a in self.alerts.engine.active_alerts.values()}
+        for name, prediction, p in zip(polled, predictions, confidence):
+            self.scheduler.reschedule(name, prediction, p, name in alerting, now)
+        
+        if self.project_id in monitors:
+            with metrics.time('emit'):
+                stream_hub.publish(self.project_id, stats)
+
+def watch_project(project_id):
+    """Add a project to the shared monitor loop, starting the loop if needed"""
+    global monitor_task
+    with monitor_lock:
+        if project_id not in monitors:
+            monitors[project_id] = ProjectMonitor(project_id)
+        if monitor_task is None:
+            monitor_task = socketio.start_background_task(background_monitor)
+
+def unwatch_project(project_id):
+    with monitor_lock:
+        if monitors.pop(project_id, None) is None:
+            return
+    topologies.pop(project_id, None)
+    stream_hub.forget_project(project_id)
+    # An unwatched project's history would otherwise pin its share of the quota
+    history = histories.pop(project_id, None)
+    if history is not None:
+        history.close()
+
+def monitor_tick(projects, pool, now=None):
+    """One tick for the given projects: concurrent collection, then a single batched inference"""
+    now = time.time() if now is None else now
+    tick_start = time.perf_counter()
+    # One model for the whole tick, even if a reload swaps it meanwhile
+    model_data = model_registry.current
+    fetched = []
+    for project, future in [(project, pool.submit(project.fetch, now)) for project in projects]:
+        try:
+            future.result()
+            fetched.append(project)
+        except Exception as e:
+            metrics.inc('errors_total', help='Monitor pipeline errors', stage='fetch')
+            print(f"Monitoring error ({project.project_id}): {str(e)}")
+    
+    # Projects share the poll budget. They pick their due devices one at a time, starting
+    # from a different project every tick, each taking at most an equal share of what is
+    # left, so one large unhealthy project can't starve the rest
+    if fetched:
+        first = next(tick_counter) % len(fetched)
+        order = fetched[first:] + fetched[:first]
+        for i, project in enumerate(order):
+            remaining = len(order) - i
+            project.pick(now, -(-project.scheduler.budget.available(now) // remaining))
+    
+    collected = []
+    for project, future in [(project, pool.submit(project.collect, now)) for project in fetched]:
+        try:
+            future.result()
+            collected.append(project)
+        except Exception as e:
+            metrics.inc('errors_total', help='Monitor pipeline errors', stage='collect')
+            print(f"Monitoring error ({project.project_id}): {str(e)}")
+    
+    # AI Prediction, one vectorized call for the polled devices of every project
+    features = np.vstack([p.features for p in collected] or [np.empty((0, len(FEATURE_NAMES)))])
+    predictions, confidence, scored = [None] * len(features), [None] * len(features), True
+    if model_data and len(features):
+        try:
+            labels, probabilities = score_devices(features, model_data)
+            predictions, confidence = labels.tolist(), probabilities.tolist()
+            metrics.inc('predictions_total', len(features), help='Devices scored by the model')
+        except Exception as e:
+            metrics.inc('errors_total', help='Monitor pipeline errors', stage='predict')
+            print(f"Prediction error: {str(e)}")
+            scored = False
+    
+    offset = 0
+    for project in collected:
+        end = offset + len(project.polled)
+        try:
+            project.apply(now, predictions[offset:end], confidence[offset:end], scored, model_data)
+        except Exception as e:
+            metrics.inc('errors_total', help='Monitor pipeline errors', stage='apply')
+            print(f"Monitoring error ({project.project_id}): {str(e)}")
+        offset = end
+    
+    elapsed = time.perf_counter() - tick_start
+    metrics.observe('tick', elapsed)
+    metrics.inc('ticks_total', help='Monitor loop ticks')
+    metrics.inc('polls_total', len(features), help='Device polls')
+    return elapsed
+
+def background_monitor():
+    """Tick every watched project until none are left"""
+    global monitor_task
+    pool = ThreadPoolExecutor(max_workers=MONITOR_WORKERS, thread_name_prefix='monitor')
+    while True:
+        with monitor_lock:
+            projects = list(monitors.values())
+            if not projects:
+                monitor_task = None
+                break
+        
+        # A tick that takes longer than the interval delays every project
+        elapsed = monitor_tick(projects, pool)
+        if elapsed > MONITOR_INTERVAL:
+            metrics.inc('tick_overruns_total', help='Ticks that took longer than MONITOR_INTERVAL')
+        socketio.sleep(max(MONITOR_INTERVAL - elapsed, 0))
+    pool.shutdown(wait=False)
+
+# Routes
+@app.route('/')
+def dashboard():
+    return render_template('index.html')
+
+def move_viewer(sid, project_id):
+    """Move a connected dashboard into the room of the given project"""
+    previous = viewers.get(sid)
+    if previous == project_id:
+        return
+    if previous:
+        leave_room(previous, sid=sid, namespace='/')
+    join_room(project_id, sid=sid, namespace='/')
+    viewers[sid] = project_id
+    # Every dashboard starts from a full snapshot, then receives deltas
+    stream_hub.join(sid, project_id)
+
+@socketio.on('connect')
+def handle_connect():
+    if ACTIVE_PROJECT:
+        move_viewer(request.sid, ACTIVE_PROJECT)
+    else:
+        viewers[request.sid] = None
+
+@socketio.on('view_project')
+def handle_view_project(data):
+    """Let one dashboard switch to another watched project without affecting the others"""
+    project_id = data.get('project_id')
+    if project_id:
+        watch_project(project_id)
+        move_viewer(request.sid, project_id)
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    project_id = viewers.pop(request.sid, None)
+    stream_hub.leave(request.sid)
+    if project_id:
+        leave_room(project_id)
+
+if __name__ == '__main__':
     socketio.run(app, debug=True, port=5000, host='127.0.0.1')
\ No newline at end of file
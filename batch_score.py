@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from dataset_schema import FEATURE_COLUMNS, LABEL_COLUMN, CLASSES
+from feature_store import FeatureStore, encode_labels
+from model_registry import discover, load_artifact, top_confidence, validate
+
+CHUNK_ROWS = 200_000    # Rows read from the CSV or store and sent to a worker at once
+PREDICT_BATCH = 8192    # Rows per model.predict call inside a worker
+OUTPUT_DIR = 'batch_scores'
+ID_COLUMNS = ['timestamp', 'device_id']
+
+_worker_model = None
+
+
+def choose_model(path=None):
+    """The given artifact, or the newest one that passes validation"""
+    candidates = [path] if path else [v.path for v in discover()]
+    for candidate in candidates:
+        try:
+            model_data = load_artifact(candidate)
+            validate(model_data)
+            return candidate
+        except Exception as e:
+            print(f"Skipping model {candidate}: {str(e)}")
+    raise SystemExit("No usable model artifact found")
+
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = load_artifact(model_path)
+
+
+def score_chunk(X, batch_size=PREDICT_BATCH):
+    """Class codes and top probabilities for one chunk, scored in large batches"""
+    scaled = _worker_model['scaler'].transform(X)
+    codes = np.empty(len(X), dtype=np.int8)
+    confidence = np.empty(len(X), dtype=np.float32)
+    for start in range(0, len(X), batch_size):
+        pred = np.asarray(_worker_model['model'].predict(scaled[start:start + batch_size],
+                                                         batch_size=batch_size, verbose=0))
+        codes[start:start + batch_size] = np.argmax(pred, axis=1)
+        confidence[start:start + batch_size] = top_confidence(pred)
+    return codes, confidence
+
+
+def read_csv(csv_path, chunksize=CHUNK_ROWS):
+    """has_labels, then (ids, features, label codes or None) per chunk of a telemetry CSV"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    has_labels = LABEL_COLUMN in header
+    usecols = [c for c in ID_COLUMNS if c in header] + FEATURE_COLUMNS + ([LABEL_COLUMN] if has_labels else [])
+
+    def chunks():
+        for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunksize):
+            yield (chunk[[c for c in ID_COLUMNS if c in chunk]], chunk[FEATURE_COLUMNS].to_numpy(dtype=np.float64),
+                   encode_labels(chunk[LABEL_COLUMN].to_numpy()) if has_labels else None)
+    return has_labels, chunks()
+
+
+def read_store(store_dir, chunksize=CHUNK_ROWS):
+    """The same from a memory-mapped feature store, sliced without parsing; it keeps no ids, so rows are numbered"""
+    store = FeatureStore(store_dir)
+
+    def chunks():
+        start = 0
+        for X, labels in store.iter_batches(chunksize):
+            yield pd.DataFrame({'row': np.arange(start, start + len(X))}), X, labels
+            start += len(X)
+    return True, chunks()
+
+
+class TimelineBuilder:
+    """Run-length segments of the predicted class per device, carried across chunk boundaries"""
+    def __init__(self, writer):
+        self.writer = writer
+        self.open = {}  # device_id -> [class, start, end, rows]
+
+    def add(self, devices, timestamps, predictions):
+        frame = pd.DataFrame({'device_id': devices, 'timestamp': timestamps, 'prediction': predictions})
+        for device, group in frame.groupby('device_id', sort=False):
+            labels = group['prediction'].to_numpy()
+            times = group['timestamp'].to_numpy()
+            change = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+            segment = self.open.get(device)
+            for start, end in zip(np.r_[0, change], np.r_[change, len(labels)]):
+                if segment is not None and segment[0] == labels[start]:
+                    segment[2] = times[end - 1]
+                    segment[3] += end - start
+                    continue
+                if segment is not None:
+                    self.writer.writerow([device, *segment])
+                segment = [labels[start], times[start], times[end - 1], end - start]
+            self.open[device] = segment
+
+    def close(self):
+        for device, segment in self.open.items():
+            self.writer.writerow([device, *segment])
+        self.open.clear()
+
+
+def batch_score(source, output_dir=OUTPUT_DIR, model_path=None, chunksize=CHUNK_ROWS,
+                workers=None, batch_size=PREDICT_BATCH):
+    """Stream a feature store directory (or a telemetry CSV) through a pool of scoring processes
+    and write predictions, per-device timelines and a confusion matrix against issue_detected"""
+    model_path = choose_model(model_path)
+    workers = workers or os.cpu_count()
+    os.makedirs(output_dir, exist_ok=True)
+    has_labels, chunks = (read_store if os.path.isdir(source) else read_csv)(source, chunksize)
+
+    confusion = np.zeros((len(CLASSES), len(CLASSES)), dtype=np.int64)
+    rows = 0
+    start = time.perf_counter()
+    # Spawned workers each load the model once; forking after TensorFlow has started is unsafe
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker, initargs=(model_path,))
+    with pool, open(os.path.join(output_dir, 'predictions.csv'), 'w', newline='') as predictions_file, \
+            open(os.path.join(output_dir, 'timelines.csv'), 'w', newline='') as timelines_file:
+        timelines_writer = csv.writer(timelines_file)
+        timelines_writer.writerow(['device_id', 'prediction', 'start', 'end', 'rows'])
+        timelines = TimelineBuilder(timelines_writer)
+        first = True
+
+        def write(ids, actual, codes, confidence):
+            nonlocal first, rows
+            labels = np.asarray(CLASSES, dtype=object)[codes]
+            out = ids.copy()
+            out['prediction'] = labels
+            out['confidence'] = np.round(confidence, 4)
+            if actual is not None:
+                out[LABEL_COLUMN] = np.asarray(CLASSES, dtype=object)[actual]
+                confusion.flat[:] += np.bincount(actual.astype(np.int64) * len(CLASSES) + codes,
+                                                 minlength=confusion.size)
+            out.to_csv(predictions_file, header=first, index=False)
+            first = False
+            if 'device_id' in ids:
+                timelines.add(ids['device_id'].to_numpy(),
+                              ids['timestamp'].to_numpy() if 'timestamp' in ids else ids.index.to_numpy(),
+                              labels)
+            rows += len(ids)
+            print(f"Scored {rows} rows ({rows / (time.perf_counter() - start):.0f} rows/s)")
+
+        # Keep a couple of chunks per worker in flight and write results back in input order
+        in_flight = deque()
+        for ids, X, actual in chunks:
+            in_flight.append((ids, actual, pool.submit(score_chunk, X, batch_size)))
+            if len(in_flight) >= 2 * workers:
+                ids, actual, future = in_flight.popleft()
+                write(ids, actual, *future.result())
+        while in_flight:
+            ids, actual, future = in_flight.popleft()
+            write(ids, actual, *future.result())
+        timelines.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {'source': os.path.abspath(source), 'model': model_path, 'rows': rows,
+               'workers': workers, 'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed else None}
+    if has_labels:
+        pd.DataFrame(confusion, index=pd.Index(CLASSES, name='actual'), columns=CLASSES) \
+            .to_csv(os.path.join(output_dir, 'confusion_matrix.csv'))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            recall = np.diag(confusion) / confusion.sum(axis=1)
+            precision = np.diag(confusion) / confusion.sum(axis=0)
+        summary['accuracy'] = float(np.trace(confusion) / confusion.sum()) if rows else None
+        summary['per_class'] = {
+            label: {'support': int(confusion[i].sum()),
+                    'precision': None if np.isnan(precision[i]) else float(precision[i]),
+                    'recall': None if np.isnan(recall[i]) else float(recall[i])}
+            for i, label in enumerate(CLASSES)
+        }
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Scored {rows} rows in {elapsed:.1f}s with {workers} worker(s)"
+          + (f", accuracy {summary['accuracy']:.2%}" if summary.get('accuracy') is not None else ""))
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score historical telemetry with a trained monitor model")
+    parser.add_argument('source', help="Feature store directory (see feature_store.py) or telemetry CSV")
+    parser.add_argument('--model', help="Artifact to use (default: newest valid one, as the app picks)")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=None, help="Scoring processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=PREDICT_BATCH)
+    args = parser.parse_args()
+    batch_score(args.source, args.output_dir, args.model, args.chunksize, args.workers, args.batch_size)
@@ -0,0 +1,321 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from dataset_schema import FEATURE_COLUMNS
+
+BUILD_SIZES = [50, 500, 5000]
+MONITOR_SIZES = [50, 500, 5000]
+CLIENT_COUNTS = [1, 10, 50]
+INFERENCE_BATCHES = [1, 32, 1024, 8192]
+SINGLE_ROW_CALLS = 200
+LATENCY = 0.005   # Seconds the fake GNS3 server adds to every request
+MONITOR_TICKS = 5
+TRAINING_ROWS = 20000
+TRAINING_EPOCHS = 2
+SEED = 42
+DATA_PATH = 'network_performance_dataset.csv'
+MODEL_ARTIFACTS = ['model/network_ai.npz', 'network_ai.joblib', 'quantum_inspired_network.joblib']
+RESULTS_DIR = 'benchmark_results'
+REGRESSION_THRESHOLD = 0.10  # Relative change reported when comparing with a baseline
+
+# --quick keeps every suite but shrinks it to run in about a minute
+QUICK = {'build': [50], 'monitor': [50, 500], 'clients': [1, 10], 'ticks': 3,
+         'batches': [1, 1024], 'training_rows': 2000, 'epochs': 1}
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Hide the progress prints of the code under test"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def _sample_features(rows):
+    """Real telemetry rows when the dataset is present, else a fixed-seed random matrix"""
+    if os.path.exists(DATA_PATH):
+        import pandas as pd
+        X = pd.read_csv(DATA_PATH, usecols=FEATURE_COLUMNS, nrows=rows)[FEATURE_COLUMNS].to_numpy()
+        if len(X) >= rows:
+            return X
+    rng = np.random.default_rng(SEED)
+    return rng.uniform(0, 100, size=(rows, len(FEATURE_COLUMNS)))
+
+
+def bench_build(sizes, latency):
+    """Wall time and API calls of GNS3NetworkBuilder.build_network against a fresh fake server"""
+    from create_nw import GNS3NetworkBuilder
+    from fake_gns3 import FakeGNS3Server
+
+    results = []
+    for devices in sizes:
+        server = FakeGNS3Server(latency=latency).start()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                builder = GNS3NetworkBuilder(server=server.url, target_devices=devices,
+                                             manifest_path=os.path.join(tmp, 'manifest.json'),
+                                             topology_path=os.path.join(tmp, 'topology.json'))
+                wall, cpu = time.perf_counter(), time.process_time()
+                with _quiet():
+                    builder.build_network()
+                wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        finally:
+            server.stop()
+        results.append({'devices': devices, 'latency_ms': latency * 1000, 'wall_s': wall, 'cpu_s': cpu,
+                        'api_calls': server.state.request_count, 'created': builder.successful_devices})
+        print(f"build {devices:>5} devices: {wall:.2f}s wall, {server.state.request_count} API calls")
+    return results
+
+
+def _serve_networks(sizes, latency, conn):
+    """Child process: serve one pre-built project per size so its CPU isn't charged to the monitor"""
+    from fake_gns3 import FakeGNS3Server
+    server = FakeGNS3Server(latency=latency)
+    projects = {devices: server.state.add_network(f'bench-{devices}', devices)['project_id'] for devices in sizes}
+    conn.send((server.url, projects))
+    server.serve_forever()
+
+
+def bench_monitor(sizes, client_counts, latency, ticks):
+    """Tick latency and CPU of the monitor loop vs device count and connected dashboards"""
+    with _quiet():
+        import app
+    from gns3_client import GNS3Client
+    from scheduler import PollScheduler
+
+    # Importing app starts the registry's background load; finish it here and pin the result,
+    # so every timed tick runs inference on the same model however fast the load was
+    registry = app.model_registry
+    registry.interval = 0
+    with _quiet():
+        registry.refresh()
+    if registry.current is None:
+        raise RuntimeError(f"No model available for the monitor benchmark: {registry.errors or 'no artifacts found'}")
+    registry.pinned = registry.active.path
+
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve_networks, args=(sizes, latency, child), daemon=True)
+    process.start()
+    url, projects = parent.recv()
+    app.gns3 = GNS3Client(url)
+
+    emitted = [0]
+    def emit(event, payload, sid, callback):
+        emitted[0] += 1
+        callback()  # Dashboards that acknowledge instantly
+    app.stream_hub.emit = emit
+    app.stream_hub.min_interval = 0
+
+    results = []
+    pool = ThreadPoolExecutor(max_workers=app.MONITOR_WORKERS)
+    try:
+        for devices in sizes:
+            project_id = projects[devices]
+            for clients in client_counts:
+                monitor = app.ProjectMonitor(project_id)
+                # Poll every device on every tick: a worst case that doesn't depend on the scheduler
+                monitor.scheduler = PollScheduler(fast_interval=0, max_interval=0, max_per_second=1e9)
+                app.monitors[project_id] = monitor
+                sids = [f'bench-{i}' for i in range(clients)]
+                for sid in sids:
+                    app.stream_hub.join(sid, project_id)
+
+                walls, cpus = [], []
+                emitted[0] = 0
+                for _ in range(ticks):
+                    # Production ticks outlive the node cache, so every tick refetches
+                    app.gns3.invalidate(project_id)
+                    cpu = time.process_time()
+                    with _quiet():
+                        walls.append(app.monitor_tick([monitor], pool))
+                    cpus.append(time.process_time() - cpu)
+
+                for sid in sids:
+                    app.stream_hub.leave(sid)
+                app.unwatch_project(project_id)
+                app.histories.pop(project_id, None)
+                app.project_alerts.pop(project_id, None)
+
+                results.append({'devices': devices, 'clients': clients, 'ticks': ticks,
+                                'model': registry.active.path,
+                                'first_tick_s': walls[0], 'mean_tick_s': float(np.mean(walls[1:] or walls)),
+                                'max_tick_s': max(walls), 'mean_cpu_s': float(np.mean(cpus)),
+                                'emits_per_tick': emitted[0] / ticks})
+                print(f"monitor {devices:>5} devices / {clients:>2} clients: "
+                      f"{results[-1]['mean_tick_s'] * 1000:.1f} ms per tick, {results[-1]['mean_cpu_s'] * 1000:.1f} ms CPU")
+    finally:
+        pool.shutdown()
+        process.terminate()
+    return results
+
+
+def _load_models():
+    """Every model artifact that loads here, plus an untrained model.py network if TensorFlow is present"""
+    from joblib import load
+    from numpy_model import load_numpy_model
+
+    models, skipped = {}, {}
+    for path in MODEL_ARTIFACTS:
+        if not os.path.exists(path):
+            skipped[path] = 'not found'
+            continue
+        try:
+            models[path] = load_numpy_model(path) if path.endswith('.npz') else load(path)
+        except Exception as e:
+            skipped[path] = str(e)
+    try:
+        from model import QuantumInspiredMonitor
+        monitor = QuantumInspiredMonitor()
+        monitor.scaler.fit(_sample_features(1000))
+        models['model.py (untrained)'] = {'model': monitor.build_model(), 'scaler': monitor.scaler}
+    except Exception as e:
+        skipped['model.py (untrained)'] = str(e)
+    return models, skipped
+
+
+def bench_inference(batches):
+    """Rows per second of each model, one row per call vs one call per batch"""
+    models, skipped = _load_models()
+    X = _sample_features(max(batches + [SINGLE_ROW_CALLS]))
+    results = []
+    for name, data in models.items():
+        def predict(batch):
+            scaled = data['scaler'].transform(batch)
+            return data['model'].predict(scaled, batch_size=len(batch), verbose=0)
+
+        predict(X[:1])  # Warm up lazily built graphs
+        start = time.perf_counter()
+        for i in range(SINGLE_ROW_CALLS):
+            predict(X[i:i + 1])
+        single = SINGLE_ROW_CALLS / (time.perf_counter() - start)
+        results.append({'model': name, 'mode': 'single_row', 'batch': 1, 'rows_per_s': single})
+
+        for batch in batches:
+            repeats = max(3, min(100, 20000 // batch))
+            start = time.perf_counter()
+            for _ in range(repeats):
+                predict(X[:batch])
+            elapsed = (time.perf_counter() - start) / repeats
+            results.append({'model': name, 'mode': 'batched', 'batch': batch,
+                            'latency_ms': elapsed * 1000, 'rows_per_s': batch / elapsed})
+        print(f"inference {name}: {single:.0f} rows/s single-row, "
+              f"{results[-1]['rows_per_s']:.0f} rows/s at batch {batches[-1]}")
+    for name, reason in skipped.items():
+        print(f"inference {name}: skipped ({reason})")
+    return {'results': results, 'skipped': skipped}
+
+
+def bench_training(rows, epochs):
+    """Seconds per epoch of the model.py network on the first rows of the dataset"""
+    try:
+        import tensorflow as tf
+        from model import QuantumInspiredMonitor
+    except ImportError as e:
+        print(f"training: skipped ({str(e)})")
+        return {'skipped': str(e)}
+
+    tf.random.set_seed(SEED)
+    import pandas as pd
+    from feature_store import encode_labels
+    from dataset_schema import LABEL_COLUMN
+    df = pd.read_csv(DATA_PATH, usecols=FEATURE_COLUMNS + [LABEL_COLUMN], nrows=rows)
+    monitor = QuantumInspiredMonitor()
+    X = monitor.scaler.fit_transform(df[FEATURE_COLUMNS].to_numpy())
+    y = encode_labels(df[LABEL_COLUMN].to_numpy())
+
+    epoch_times = []
+    class EpochTimer(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+        def on_epoch_end(self, epoch, logs=None):
+            epoch_times.append(time.perf_counter() - self.start)
+
+    model = monitor.build_model()
+    model.fit(X, y, epochs=epochs, batch_size=32, validation_split=0.2, verbose=0, callbacks=[EpochTimer()])
+    print(f"training {len(X)} rows: {np.mean(epoch_times):.2f}s per epoch")
+    return {'rows': len(X), 'epochs': epochs, 'epoch_s': epoch_times,
+            'mean_epoch_s': float(np.mean(epoch_times[1:] or epoch_times))}
+
+
+def _flatten(results):
+    """Map 'suite[key=value,...].metric' to numbers so two runs can be compared"""
+    flat = {}
+    for suite, data in results['suites'].items():
+        rows = data['results'] if isinstance(data, dict) and 'results' in data else data
+        if isinstance(rows, dict):
+            rows = [rows]
+        for row in rows:
+            keys = ','.join(f'{k}={v}' for k, v in row.items() if isinstance(v, str) or k in ('devices', 'clients', 'batch'))
+            for k, v in row.items():
+                if isinstance(v, float):
+                    flat[f'{suite}[{keys}].{k}'] = v
+    return flat
+
+
+def compare(baseline_path, results):
+    with open(baseline_path) as f:
+        baseline = _flatten(json.load(f))
+    current = _flatten(results)
+    print(f"\nChanges of more than {REGRESSION_THRESHOLD:.0%} against {baseline_path}:")
+    for key in sorted(set(baseline) & set(current)):
+        if baseline[key] and abs(current[key] / baseline[key] - 1) > REGRESSION_THRESHOLD:
+            print(f"  {key}: {baseline[key]:.4g} -> {current[key]:.4g} ({current[key] / baseline[key] - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark network building, monitoring, inference and training")
+    parser.add_argument('--suites', default='build,monitor,inference,training',
+                        help="Comma-separated subset of build, monitor, inference, training")
+    parser.add_argument('--quick', action='store_true', help="Smaller sizes for a fast smoke run")
+    parser.add_argument('--latency', type=float, default=LATENCY, help="Seconds added to every fake GNS3 request")
+    parser.add_argument('--output', help="Results file (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    np.random.seed(SEED)
+    suites = args.suites.split(',')
+    quick = QUICK if args.quick else {}
+    results = {'environment': environment(), 'quick': args.quick, 'suites': {}}
+    if 'build' in suites:
+        results['suites']['build'] = bench_build(quick.get('build', BUILD_SIZES), args.latency)
+    if 'monitor' in suites:
+        results['suites']['monitor'] = bench_monitor(quick.get('monitor', MONITOR_SIZES),
+                                                     quick.get('clients', CLIENT_COUNTS),
+                                                     args.latency, quick.get('ticks', MONITOR_TICKS))
+    if 'inference' in suites:
+        results['suites']['inference'] = bench_inference(quick.get('batches', INFERENCE_BATCHES))
+    if 'training' in suites:
+        results['suites']['training'] = bench_training(quick.get('training_rows', TRAINING_ROWS),
+                                                       quick.get('epochs', TRAINING_EPOCHS))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+    if args.baseline:
+        compare(args.baseline, results)
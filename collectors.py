@@ -0,0 +1,171 @@
+import abc
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from dataset_schema import FEATURE_COLUMNS
+
+COLLECTOR_WORKERS = 64  # Nodes read at once
+COLLECTOR_TIMEOUT = 2.0  # Seconds each node's read may take, counted from when it starts
+# Where the http collector finds a node's metrics agent; formatted with the GNS3 node dict
+AGENT_URL = 'http://{console_host}:9100/metrics'
+
+# Simulated reading ranges per feature, as (low, high)
+SIMULATED_RANGES = {
+    'cpu_usage': (0, 100),
+    'memory_usage': (0, 100),
+    'bandwidth_mbps': (0, 1000),
+    'latency_ms': (1, 200),
+    'packet_loss_percent': (0, 10),
+    'error_rate_percent': (0, 20),
+}
+
+
+class Collector(abc.ABC):
+    """Reads the model's six features from one node; subclass and register to add a backend"""
+    name = None
+
+    @abc.abstractmethod
+    def collect(self, node, timeout):
+        """Return {feature column: value} for a GNS3 node dict, finishing within timeout seconds"""
+
+    def collect_batch(self, nodes, timeout):
+        """Optional fast path returning an (n, 6) matrix for all nodes at once, or None"""
+        return None
+
+
+COLLECTORS = {}
+# Backends living in modules of their own, imported on first use
+COLLECTOR_MODULES = {'synthetic': 'synthetic_telemetry'}
+
+
+def register_collector(cls):
+    COLLECTORS[cls.name] = cls
+    return cls
+
+
+def get_collector(name, **options):
+    if name not in COLLECTORS and name in COLLECTOR_MODULES:
+        importlib.import_module(COLLECTOR_MODULES[name])
+    if name not in COLLECTORS:
+        raise ValueError(f"Unknown collector '{name}'. Available: {sorted(set(COLLECTORS) | set(COLLECTOR_MODULES))}")
+    return COLLECTORS[name](**options)
+
+
+@register_collector
+class SimulatedCollector(Collector):
+    """Local backend with random readings and an optional per-node delay, for tests and demos"""
+    name = 'simulated'
+
+    def __init__(self, delay=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.delay = delay
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()  # Generator objects aren't thread-safe
+        self.low = np.array([SIMULATED_RANGES[c][0] for c in FEATURE_COLUMNS], dtype=float)
+        self.high = np.array([SIMULATED_RANGES[c][1] for c in FEATURE_COLUMNS], dtype=float)
+
+    def _sample(self, n):
+        with self.lock:
+            return self.rng.uniform(self.low, self.high, size=(n, len(FEATURE_COLUMNS)))
+
+    def collect(self, node, timeout):
+        with self.lock:
+            pause = self.delay + self.jitter * self.rng.random()
+            failed = self.rng.random() < self.failure_rate
+        time.sleep(min(pause, timeout))
+        if pause > timeout:
+            raise TimeoutError(f"{node['name']} took longer than {timeout}s")
+        if failed:
+            raise ConnectionError(f"{node['name']} did not answer")
+        return dict(zip(FEATURE_COLUMNS, self._sample(1)[0]))
+
+    def collect_batch(self, nodes, timeout):
+        if self.delay or self.jitter or self.failure_rate:
+            return None
+        return self._sample(len(nodes))
+
+
+@register_collector
+class HttpCollector(Collector):
+    """Reads a JSON object of feature values from an agent running on each node
+
+    url is formatted with the node dict (e.g. {name}, {console_host}); urls maps node names
+    to explicit addresses for agents that can't be derived from GNS3. fields renames agent
+    keys to feature columns.
+    """
+    name = 'http'
+
+    def __init__(self, url=AGENT_URL, urls=None, fields=None, pool_size=COLLECTOR_WORKERS):
+        self.url = url
+        self.urls = urls or {}
+        self.fields = fields or {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def collect(self, node, timeout):
+        url = self.urls.get(node['name']) or self.url.format_map(node)
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        reading = {self.fields.get(key, key): value for key, value in response.json().items()}
+        missing = [column for column in FEATURE_COLUMNS if column not in reading]
+        if missing:
+            raise ValueError(f"{node['name']} agent did not report {', '.join(missing)}")
+        return {column: float(reading[column]) for column in FEATURE_COLUMNS}
+
+
+class CollectorPool:
+    """Collects all nodes concurrently, giving each read the full timeout from when it starts"""
+    def __init__(self, collector, workers=COLLECTOR_WORKERS, timeout=COLLECTOR_TIMEOUT):
+        self.collector = collector
+        self.workers = workers
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='collector')
+
+    def _read(self, node):
+        start = time.monotonic()
+        reading = self.collector.collect(node, self.timeout)
+        if time.monotonic() - start > self.timeout:
+            raise TimeoutError('timeout')
+        return reading
+
+    def collect(self, nodes):
+        """Return (matrix, status): one FEATURE_COLUMNS row per node, NaN where a node timed out or failed
+
+        status maps each node name to 'ok', 'timeout' or the error message.
+        """
+        matrix = np.full((len(nodes), len(FEATURE_COLUMNS)), np.nan)
+        if not nodes:
+            return matrix, {}
+        batch = self.collector.collect_batch(nodes, self.timeout)
+        if batch is not None:
+            return np.asarray(batch, dtype=float), {node['name']: 'ok' for node in nodes}
+
+        # Reads past their own deadline fail in _read. Nodes queued behind the workers start
+        # late but still get the full timeout, so the round may last one timeout per wave of
+        # workers; reads that ignore their timeout are given up on after that
+        futures = [self.pool.submit(self._read, node) for node in nodes]
+        waves = -(-len(nodes) // self.workers)
+        done, _ = wait(futures, timeout=waves * self.timeout)
+        status = {}
+        for i, (node, future) in enumerate(zip(nodes, futures)):
+            if future not in done:
+                # A hung read keeps its thread until it returns
+                future.cancel()
+                status[node['name']] = 'timeout'
+                continue
+            try:
+                reading = future.result()
+                matrix[i] = [reading.get(column, np.nan) for column in FEATURE_COLUMNS]
+                status[node['name']] = 'ok'
+            except (TimeoutError, requests.Timeout):
+                status[node['name']] = 'timeout'
+            except Exception as e:
+                status[node['name']] = str(e)
+        return matrix, status
@@ -1,267 +1,477 @@
-import requests
-import json
-import time
-import math
-from urllib3.exceptions import InsecureRequestWarning
-
-# Disable SSL warnings
-requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
-
-# GNS3 Server Configuration
-GNS3_SERVER = "http://localhost:3080"
-PROJECT_NAME = "Auto_Configured_VPCS_Network2"
-SWITCH_TEMPLATE = "Ethernet switch"
-VPCS_TEMPLATE = "VPCS"
-SWITCH_PORTS = 8  # Standard 8-port Ethernet switch
-DEVICES_PER_SWITCH = SWITCH_PORTS - 1  # Reserve 1 port for uplink
-TARGET_DEVICES = 50
-
-# Network Configuration
-BASE_IP = "192.168.1."
-SUBNET_MASK = "255.255.255.0"
-GATEWAY_IP = BASE_IP + "1"
-
-class GNS3NetworkBuilder:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.verify = False
-        self.project_id = None
-        self.nodes = {}
-        self.links = []
-        self.template_ids = {}
-        self.successful_devices = 0
-        self.startup_scripts = {}
-
-    def create_project(self):
-        """Create a new GNS3 project"""
-        payload = {
-            "name": PROJECT_NAME,
-            "auto_close": False,
-            "auto_open": True,
-            "auto_start": True  # Auto-start all devices
-        }
-        
-        response = self.session.post(
-            f"{GNS3_SERVER}/v2/projects",
-            json=payload
-        )
-        
-        if response.status_code == 201:
-            self.project_id = response.json()["project_id"]
-            print(f"Project '{PROJECT_NAME}' created successfully")
-            time.sleep(2)  # Wait for project to initialize
-            return self.project_id
-        raise Exception(f"Failed to create project: {response.text}")
-
-    def get_template_id(self, template_name):
-        """Get template ID by name"""
-        response = self.session.get(f"{GNS3_SERVER}/v2/templates")
-        if response.status_code != 200:
-            raise Exception(f"Failed to get templates: {response.text}")
-            
-        for template in response.json():
-            if template["name"].lower() == template_name.lower():
-                return template["template_id"]
-        raise Exception(f"Template '{template_name}' not found")
-
-    def create_node(self, name, template_id, node_type, x, y, properties=None):
-        """Create a single node with error handling"""
-        try:
-            payload = {
-                "name": name,
-                "node_type": node_type,
-                "compute_id": "local",
-                "template_id": template_id,
-                "x": int(round(x)),
-                "y": int(round(y)),
-                "properties": properties if properties else {}
-            }
-            
-            response = self.session.post(
-                f"{GNS3_SERVER}/v2/projects/{self.project_id}/nodes",
-                json=payload,
-                timeout=10
-            )
-            
-            if response.status_code == 201:
-                node_data = response.json()
-                self.nodes[name] = node_data
-                print(f"Created {name} at ({payload['x']}, {payload['y']})")
-                return node_data
-            print(f"Warning: Failed to create {name}: {response.text}")
-            return None
-        except Exception as e:
-            print(f"Warning: Failed to create {name}: {str(e)}")
-            return None
-
-    def create_link(self, node1, port1, node2, port2):
-        """Create a link between two nodes with error handling"""
-        try:
-            if node1 not in self.nodes or node2 not in self.nodes:
-                print(f"Warning: Cannot create link - nodes missing: {node1} or {node2}")
-                return None
-                
-            payload = {
-                "nodes": [
-                    {
-                        "node_id": self.nodes[node1]["node_id"],
-                        "adapter_number": 0,
-                        "port_number": port1
-                    },
-                    {
-                        "node_id": self.nodes[node2]["node_id"],
-                        "adapter_number": 0,
-                        "port_number": port2
-                    }
-                ]
-            }
-            
-            response = self.session.post(
-                f"{GNS3_SERVER}/v2/projects/{self.project_id}/links",
-                json=payload,
-                timeout=10
-            )
-            
-            if response.status_code == 201:
-                self.links.append(response.json())
-                print(f"Created link: {node1}:{port1} <-> {node2}:{port2}")
-                return response.json()
-            print(f"Warning: Failed to create link {node1}:{port1} <-> {node2}:{port2}: {response.text}")
-            return None
-        except Exception as e:
-            print(f"Warning: Failed to create link: {str(e)}")
-            return None
-
-    def configure_vpcs(self, device_name, ip_address):
-        """Create startup script for VPCS device"""
-        script = f"""
-        ip {ip_address} {SUBNET_MASK} {GATEWAY_IP}
-        save
-        """
-        self.startup_scripts[device_name] = script
-
-    def upload_configs(self):
-        """Upload configurations to all VPCS devices"""
-        for device_name, script in self.startup_scripts.items():
-            if device_name in self.nodes:
-                node_id = self.nodes[device_name]["node_id"]
-                url = f"{GNS3_SERVER}/v2/projects/{self.project_id}/nodes/{node_id}/files/startup.vpc"
-                response = self.session.post(
-                    url,
-                    data=script,
-                    headers={"Content-Type": "text/plain"}
-                )
-                if response.status_code == 204:
-                    print(f"Configured {device_name}")
-                else:
-                    print(f"Failed to configure {device_name}: {response.text}")
-
-    def build_network(self):
-        """Build and auto-configure the complete network"""
-        try:
-            print("Starting auto-configured network construction...")
-            
-            # Create project
-            self.create_project()
-            
-            # Get template IDs
-            switch_template_id = self.get_template_id(SWITCH_TEMPLATE)
-            vpcs_template_id = self.get_template_id(VPCS_TEMPLATE)
-            
-            # Create core switch (will act as gateway)
-            core_switch = self.create_node(
-                "Core-Switch", 
-                switch_template_id, 
-                "ethernet_switch", 
-                0, -200
-            )
-            if not core_switch:
-                print("Failed to create core switch, aborting")
-                return
-            
-            # Create access switches and VPCS devices
-            device_count = 0
-            successful_switches = 0
-            
-            for switch_num in range(1, (TARGET_DEVICES // DEVICES_PER_SWITCH) + 2):
-                # Position switches in a circle around core
-                angle = 2 * math.pi * (switch_num-1) / ((TARGET_DEVICES // DEVICES_PER_SWITCH) + 1)
-                x = 400 * math.cos(angle)
-                y = 400 * math.sin(angle)
-                
-                switch_name = f"Access-Switch-{switch_num}"
-                switch_node = self.create_node(
-                    switch_name, 
-                    switch_template_id, 
-                    "ethernet_switch", 
-                    x, y
-                )
-                if not switch_node:
-                    continue
-                
-                # Connect to core switch
-                if not self.create_link("Core-Switch", switch_num, switch_name, 0):
-                    continue
-                
-                successful_switches += 1
-                
-                # Create VPCS devices on this switch
-                for port in range(1, SWITCH_PORTS):
-                    if device_count >= TARGET_DEVICES:
-                        break
-                    
-                    device_count += 1
-                    # Position devices around their switch
-                    pc_angle = 2 * math.pi * (port-1) / (SWITCH_PORTS-1)
-                    pc_x = x + 150 * math.cos(pc_angle)
-                    pc_y = y + 150 * math.sin(pc_angle)
-                    
-                    pc_name = f"PC-{device_count}"
-                    pc_ip = BASE_IP + str(device_count + 10)  # IPs start at .11
-                    
-                    # Create VPCS with auto-configuration
-                    pc_node = self.create_node(
-                        pc_name, 
-                        vpcs_template_id, 
-                        "vpcs", 
-                        pc_x, pc_y,
-                        properties={"console_auto_start": True}
-                    )
-                    if not pc_node:
-                        continue
-                    
-                    if self.create_link(switch_name, port, pc_name, 0):
-                        self.successful_devices += 1
-                        self.configure_vpcs(pc_name, pc_ip)
-            
-            # Upload all configurations
-            self.upload_configs()
-            
-            print("\nNetwork construction and configuration completed!")
-            print(f"Successfully created and configured:")
-            print(f"- 1 Core switch")
-            print(f"- {successful_switches} Access switches")
-            print(f"- {self.successful_devices} VPCS devices")
-            print(f"- {len(self.links)} links")
-            
-            print(f"""
-            Network is ready to use!
-            All VPCS devices are pre-configured with:
-            - IP range: {BASE_IP}11 to {BASE_IP}{10+self.successful_devices}
-            - Subnet mask: {SUBNET_MASK}
-            - Gateway: {GATEWAY_IP}
-            
-            To test connectivity:
-            1. Open GNS3 and wait for all devices to start
-            2. Open console on any VPCS device
-            3. Run: ping {BASE_IP}12
-            """)
-            
-        except Exception as e:
-            print(f"Fatal error: {str(e)}")
-            if self.project_id:
-                print(f"Project ID {self.project_id} was created")
-
-if __name__ == "__main__":
-    builder = GNS3NetworkBuilder()
+import json
+import os
+import time
+import math
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from gns3_client import GNS3Client
+
+# GNS3 Server Configuration
+GNS3_SERVER = "http://localhost:3080"
+PROJECT_NAME = "Auto_Configured_VPCS_Network2"
+SWITCH_TEMPLATE = "Ethernet switch"
+VPCS_TEMPLATE = "VPCS"
+SWITCH_PORTS = 8  # Standard 8-port Ethernet switch
+DEVICES_PER_SWITCH = SWITCH_PORTS - 1  # Reserve 1 port for uplink
+TARGET_DEVICES = 50
+
+# Build Configuration
+WORKERS = 16  # Concurrent API calls per tier; 1 builds sequentially
+PROJECT_INIT_TIMEOUT = 10
+UPLOAD_CONCURRENCY = 16
+CONFIG_MANIFEST = "config_manifest.json"  # project id -> node id -> sha256 of the uploaded startup.vpc
+TOPOLOGY_FILE = "topology.json"  # Node hierarchy used for alert correlation
+# Names the builder creates; any other node in the project was added by hand and is never deleted
+MANAGED_NODE_NAME = re.compile(r"^(Core-Switch|Access-Switch-\d+|PC-\d+)$")
+
+# Network Configuration
+BASE_IP = "192.168.1."
+SUBNET_MASK = "255.255.255.0"
+GATEWAY_IP = BASE_IP + "1"
+
+def _link_key(node1, port1, node2, port2):
+    """Order-independent identity of a link between two node ports"""
+    return frozenset([(node1, port1), (node2, port2)])
+
+class GNS3NetworkBuilder:
+    def __init__(self, server=GNS3_SERVER, project_name=PROJECT_NAME, target_devices=TARGET_DEVICES,
+                 manifest_path=CONFIG_MANIFEST, topology_path=TOPOLOGY_FILE, client=None):
+        self.client = client or GNS3Client(server, pool_size=max(WORKERS, UPLOAD_CONCURRENCY))
+        self.manifest_path = manifest_path
+        self.topology_path = topology_path
+        self.project_name = project_name
+        self.target_devices = target_devices
+        self.project_id = None
+        self.nodes = {}
+        self.links = []
+        self.template_ids = {}
+        self.successful_devices = 0
+        self.startup_scripts = {}
+        self.config_report = {}
+
+    def create_project(self):
+        """Create a new GNS3 project"""
+        payload = {
+            "name": self.project_name,
+            "auto_close": False,
+            "auto_open": True,
+            "auto_start": True  # Auto-start all devices
+        }
+        
+        response = self.client.request("POST", "/v2/projects", json=payload)
+        
+        if response.status_code == 201:
+            self.project_id = response.json()["project_id"]
+            print(f"Project '{self.project_name}' created successfully")
+            self.wait_for_project()
+            return self.project_id
+        raise Exception(f"Failed to create project: {response.text}")
+
+    def open_project(self):
+        """Reuse the project named PROJECT_NAME if it exists, otherwise create it"""
+        for project in self.client.projects():
+            if project["name"] == self.project_name:
+                self.project_id = project["project_id"]
+                if project.get("status") != "opened":
+                    self.client.request("POST", f"/v2/projects/{self.project_id}/open")
+                    self.wait_for_project()
+                print(f"Using existing project '{self.project_name}'")
+                return self.project_id
+        return self.create_project()
+
+    def wait_for_project(self):
+        """Wait until the project reports itself opened instead of sleeping a fixed time"""
+        deadline = time.time() + PROJECT_INIT_TIMEOUT
+        while time.time() < deadline:
+            response = self.client.request("GET", f"/v2/projects/{self.project_id}")
+            if response.status_code == 200 and response.json().get("status") == "opened":
+                return
+            time.sleep(0.2)
+        print(f"Warning: project {self.project_id} not reported as opened after {PROJECT_INIT_TIMEOUT}s")
+
+    def get_template_id(self, template_name):
+        """Get template ID by name"""
+        return self.client.template_id(template_name)
+
+    def create_node(self, name, template_id, node_type, x, y, properties=None):
+        """Create a single node with error handling"""
+        try:
+            payload = {
+                "name": name,
+                "node_type": node_type,
+                "compute_id": "local",
+                "template_id": template_id,
+                "x": int(round(x)),
+                "y": int(round(y)),
+                "properties": properties if properties else {}
+            }
+            
+            response = self.client.request(
+                "POST",
+                f"/v2/projects/{self.project_id}/nodes",
+                json=payload
+            )
+            
+            if response.status_code == 201:
+                node_data = response.json()
+                self.nodes[name] = node_data
+                print(f"Created {name} at ({payload['x']}, {payload['y']})")
+                return node_data
+            print(f"Warning: Failed to create {name}: {response.text}")
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to create {name}: {str(e)}")
+            return None
+
+    def update_node(self, name, changes):
+        """Update properties such as the position of an existing node"""
+        node_id = self.nodes[name]["node_id"]
+        response = self.client.request(
+            "PUT",
+            f"/v2/projects/{self.project_id}/nodes/{node_id}",
+            json=changes
+        )
+        if response.status_code == 200:
+            self.nodes[name] = response.json()
+            print(f"Updated {name}: {changes}")
+            return self.nodes[name]
+        print(f"Warning: Failed to update {name}: {response.text}")
+        return None
+
+    def delete_node(self, name):
+        """Delete a node; GNS3 removes its links along with it"""
+        node_id = self.nodes[name]["node_id"]
+        response = self.client.request("DELETE", f"/v2/projects/{self.project_id}/nodes/{node_id}")
+        if response.status_code == 204:
+            del self.nodes[name]
+            print(f"Deleted {name}")
+            return name
+        print(f"Warning: Failed to delete {name}: {response.text}")
+        return None
+
+    def delete_link(self, link_id):
+        response = self.client.request("DELETE", f"/v2/projects/{self.project_id}/links/{link_id}")
+        if response.status_code == 204:
+            print(f"Deleted link {link_id}")
+            return link_id
+        print(f"Warning: Failed to delete link {link_id}: {response.text}")
+        return None
+
+    def create_link(self, node1, port1, node2, port2):
+        """Create a link between two nodes with error handling"""
+        try:
+            if node1 not in self.nodes or node2 not in self.nodes:
+                print(f"Warning: Cannot create link - nodes missing: {node1} or {node2}")
+                return None
+                
+            payload = {
+                "nodes": [
+                    {
+                        "node_id": self.nodes[node1]["node_id"],
+                        "adapter_number": 0,
+                        "port_number": port1
+                    },
+                    {
+                        "node_id": self.nodes[node2]["node_id"],
+                        "adapter_number": 0,
+                        "port_number": port2
+                    }
+                ]
+            }
+            
+            response = self.client.request(
+                "POST",
+                f"/v2/projects/{self.project_id}/links",
+                json=payload
+            )
+            
+            if response.status_code == 201:
+                self.links.append(response.json())
+                print(f"Created link: {node1}:{port1} <-> {node2}:{port2}")
+                return response.json()
+            print(f"Warning: Failed to create link {node1}:{port1} <-> {node2}:{port2}: {response.text}")
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to create link: {str(e)}")
+            return None
+
+    def configure_vpcs(self, device_name, ip_address):
+        """Create startup script for VPCS device"""
+        script = f"""
+        ip {ip_address} {SUBNET_MASK} {GATEWAY_IP}
+        save
+        """
+        self.startup_scripts[device_name] = script
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def upload_config(self, device_name, script, known_hashes):
+        """Upload one startup script unless the node already has this exact content"""
+        if device_name not in self.nodes:
+            return device_name, "missing", None
+        node_id = self.nodes[device_name]["node_id"]
+        digest = hashlib.sha256(script.encode()).hexdigest()
+        if known_hashes.get(node_id) == digest:
+            return device_name, "unchanged", digest
+        
+        url = f"/v2/projects/{self.project_id}/nodes/{node_id}/files/startup.vpc"
+        try:
+            response = self.client.request(
+                "POST",
+                url,
+                data=script,
+                headers={"Content-Type": "text/plain"}
+            )
+        except Exception as e:
+            return device_name, f"failed: {str(e)}", None
+        if response.status_code in (201, 204):
+            return device_name, "uploaded", digest
+        return device_name, f"failed: {response.text}", None
+
+    def upload_configs(self, concurrency=UPLOAD_CONCURRENCY):
+        """Upload changed configurations to all VPCS devices concurrently and report per device"""
+        manifest = self._load_manifest()
+        known_hashes = manifest.get(self.project_id, {})
+        
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            results = list(pool.map(
+                lambda item: self.upload_config(item[0], item[1], known_hashes),
+                self.startup_scripts.items()
+            ))
+        
+        # Forget nodes that no longer exist, remember what each node now holds
+        node_ids = {node["node_id"]: name for name, node in self.nodes.items()}
+        hashes = {node_id: digest for node_id, digest in known_hashes.items() if node_id in node_ids}
+        report = {}
+        for device_name, status, digest in results:
+            report[device_name] = status
+            if digest:
+                hashes[self.nodes[device_name]["node_id"]] = digest
+            if status.startswith("failed"):
+                print(f"Failed to configure {device_name}: {status[len('failed: '):]}")
+        manifest[self.project_id] = hashes
+        self._save_manifest(manifest)
+        
+        counts = {}
+        for status in report.values():
+            key = "failed" if status.startswith("failed") else status
+            counts[key] = counts.get(key, 0) + 1
+        print("Configs: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+        return report
+
+    def plan_topology(self):
+        """Lay out the access switches and VPCS devices for the target device count"""
+        switches = []
+        pcs = []
+        device_count = 0
+        switch_count = (self.target_devices // DEVICES_PER_SWITCH) + 1
+        
+        for switch_num in range(1, switch_count + 1):
+            # Position switches in a circle around core
+            angle = 2 * math.pi * (switch_num-1) / switch_count
+            x = 400 * math.cos(angle)
+            y = 400 * math.sin(angle)
+            switch_name = f"Access-Switch-{switch_num}"
+            switches.append({"name": switch_name, "uplink_port": switch_num, "x": x, "y": y})
+            
+            for port in range(1, SWITCH_PORTS):
+                if device_count >= self.target_devices:
+                    break
+                
+                device_count += 1
+                # Position devices around their switch
+                pc_angle = 2 * math.pi * (port-1) / (SWITCH_PORTS-1)
+                pcs.append({
+                    "name": f"PC-{device_count}",
+                    "switch": switch_name,
+                    "port": port,
+                    "x": x + 150 * math.cos(pc_angle),
+                    "y": y + 150 * math.sin(pc_angle),
+                    "ip": BASE_IP + str(device_count + 10)  # IPs start at .11
+                })
+        return switches, pcs
+
+    def desired_topology(self):
+        """Declarative description of the nodes, links and VPCS addresses the lab should have"""
+        switches, pcs = self.plan_topology()
+        nodes = {"Core-Switch": {"template": SWITCH_TEMPLATE, "node_type": "ethernet_switch", "x": 0, "y": -200}}
+        links = {}
+        ips = {}
+        
+        for sw in switches:
+            nodes[sw["name"]] = {"template": SWITCH_TEMPLATE, "node_type": "ethernet_switch",
+                                 "x": sw["x"], "y": sw["y"]}
+            links[_link_key("Core-Switch", sw["uplink_port"], sw["name"], 0)] = \
+                ("Core-Switch", sw["uplink_port"], sw["name"], 0)
+        for pc in pcs:
+            nodes[pc["name"]] = {"template": VPCS_TEMPLATE, "node_type": "vpcs", "x": pc["x"], "y": pc["y"],
+                                 "properties": {"console_auto_start": True}}
+            links[_link_key(pc["switch"], pc["port"], pc["name"], 0)] = (pc["switch"], pc["port"], pc["name"], 0)
+            ips[pc["name"]] = pc["ip"]
+        
+        for spec in nodes.values():
+            spec["x"], spec["y"] = int(round(spec["x"])), int(round(spec["y"]))
+        return {"nodes": nodes, "links": links, "ips": ips}
+
+    def load_current_topology(self):
+        """Fetch the nodes and links that already exist in the project"""
+        self.nodes = {node["name"]: node for node in self.client.nodes(self.project_id, fresh=True)}
+        names = {node["node_id"]: name for name, node in self.nodes.items()}
+        self.links = list(self.client.links(self.project_id, fresh=True))
+        links = {}
+        for link in self.links:
+            ends = [(names.get(n["node_id"]), n["port_number"]) for n in link["nodes"]]
+            if len(ends) == 2:
+                links[_link_key(ends[0][0], ends[0][1], ends[1][0], ends[1][1])] = link["link_id"]
+        return links
+
+    def diff_topology(self, desired, current_links, relayout=False):
+        """Work out the minimal set of node and link changes to reach the desired topology
+
+        Existing nodes keep their positions unless relayout is set, so growing a lab
+        only touches the nodes and links that are actually new. Only nodes and links the
+        builder manages (see MANAGED_NODE_NAME) are ever deleted.
+        """
+        delete_nodes = [name for name in self.nodes if name not in desired["nodes"] and MANAGED_NODE_NAME.match(name)]
+        delete_nodes += [name for name, node in self.nodes.items()
+                         if name in desired["nodes"] and node["node_type"] != desired["nodes"][name]["node_type"]]
+        kept = set(self.nodes) - set(delete_nodes)
+        
+        create_nodes = [name for name in desired["nodes"] if name not in kept]
+        update_nodes = []
+        for name in kept & set(desired["nodes"]):
+            spec, node = desired["nodes"][name], self.nodes[name]
+            changes = {k: spec[k] for k in ("x", "y") if relayout and node.get(k) != spec[k]}
+            properties = spec.get("properties", {})
+            # GNS3 reports some properties (e.g. console_auto_start) as top-level node fields
+            if any(node.get("properties", {}).get(k, node.get(k)) != v for k, v in properties.items()):
+                changes["properties"] = properties
+            if changes:
+                update_nodes.append((name, changes))
+        
+        # Links on deleted nodes disappear with them
+        delete_links = [link_id for key, link_id in current_links.items()
+                        if key not in desired["links"] and all(MANAGED_NODE_NAME.match(name) for name, _ in key)
+                        and not any(name in delete_nodes for name, _ in key)]
+        surviving = {key for key in current_links if not any(name in delete_nodes for name, _ in key)}
+        create_links = [link for key, link in desired["links"].items() if key not in surviving]
+        return {
+            "kept_links": len([key for key in surviving if key in desired["links"]]),
+            "delete_links": delete_links,
+            "delete_nodes": delete_nodes,
+            "update_nodes": update_nodes,
+            "create_nodes": create_nodes,
+            "create_links": create_links
+        }
+
+    def save_topology(self, path=None):
+        """Write the node names and links of the project for topology-aware alerting"""
+        path = path or self.topology_path
+        names = {node["node_id"]: name for name, node in self.nodes.items()}
+        links = []
+        for link in self.client.links(self.project_id, fresh=True):
+            ends = [names.get(n["node_id"]) for n in link["nodes"]]
+            if len(ends) == 2 and None not in ends:
+                links.append(ends)
+        with open(path, "w") as f:
+            json.dump({"project_id": self.project_id, "nodes": sorted(names.values()), "links": links}, f, indent=2)
+        print(f"Saved topology of {len(names)} nodes and {len(links)} links to {path}")
+
+    def _run_tier(self, pool, func, items):
+        """Run one build step for every item concurrently and return the items that succeeded"""
+        results = pool.map(lambda item: func(item) is not None, items)
+        return [item for item, ok in zip(items, results) if ok]
+
+    def build_network(self, workers=WORKERS, relayout=False):
+        """Bring the project in line with the desired topology, issuing only the calls needed"""
+        start = time.perf_counter()
+        start_requests = self.client.request_count
+        try:
+            print("Starting auto-configured network construction...")
+            
+            # Reuse the project when it already exists
+            self.open_project()
+            
+            desired = self.desired_topology()
+            plan = self.diff_topology(desired, self.load_current_topology(), relayout)
+            print(f"Plan: create {len(plan['create_nodes'])} nodes / {len(plan['create_links'])} links, "
+                  f"update {len(plan['update_nodes'])} nodes, "
+                  f"delete {len(plan['delete_nodes'])} nodes / {len(plan['delete_links'])} links")
+            
+            # Get template IDs
+            template_ids = {}
+            for name in {desired["nodes"][n]["template"] for n in plan["create_nodes"]}:
+                template_ids[name] = self.get_template_id(name)
+            
+            def create(name):
+                spec = desired["nodes"][name]
+                return self.create_node(name, template_ids[spec["template"]], spec["node_type"],
+                                        spec["x"], spec["y"], properties=spec.get("properties"))
+            
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+                self._run_tier(pool, self.delete_link, plan["delete_links"])
+                self._run_tier(pool, self.delete_node, plan["delete_nodes"])
+                self._run_tier(pool, lambda item: self.update_node(*item), plan["update_nodes"])
+                
+                # Switches before the VPCS devices hanging off them, then every link
+                # once both endpoints exist
+                switches = [n for n in plan["create_nodes"] if desired["nodes"][n]["node_type"] != "vpcs"]
+                pcs = [n for n in plan["create_nodes"] if desired["nodes"][n]["node_type"] == "vpcs"]
+                self._run_tier(pool, create, switches)
+                self._run_tier(pool, create, pcs)
+                created_links = self._run_tier(pool, lambda link: self.create_link(*link), plan["create_links"])
+            
+            # Every device gets its script; the manifest skips the ones that are unchanged
+            for name, ip in desired["ips"].items():
+                self.configure_vpcs(name, ip)
+            
+            pc_names = [name for name in self.nodes if desired["nodes"].get(name, {}).get("node_type") == "vpcs"]
+            self.successful_devices = len(pc_names)
+            successful_switches = len([name for name in self.nodes if name.startswith("Access-Switch-")])
+            
+            # Upload all configurations
+            self.config_report = self.upload_configs()
+            self.save_topology()
+            
+            print("\nNetwork construction and configuration completed!")
+            print(f"Successfully created and configured:")
+            print(f"- 1 Core switch")
+            print(f"- {successful_switches} Access switches")
+            print(f"- {self.successful_devices} VPCS devices")
+            print(f"- {plan['kept_links'] + len(created_links)} links")
+            print(f"Build time: {time.perf_counter() - start:.1f}s with {workers} worker(s), "
+                  f"{self.client.request_count - start_requests} API calls")
+            
+            print(f"""
+            Network is ready to use!
+            All VPCS devices are pre-configured with:
+            - IP range: {BASE_IP}11 to {BASE_IP}{10+self.successful_devices}
+            - Subnet mask: {SUBNET_MASK}
+            - Gateway: {GATEWAY_IP}
+            
+            To test connectivity:
+            1. Open GNS3 and wait for all devices to start
+            2. Open console on any VPCS device
+            3. Run: ping {BASE_IP}12
+            """)
+            
+        except Exception as e:
+            print(f"Fatal error: {str(e)}")
+            if self.project_id:
+                print(f"Project ID {self.project_id} was created")
+
+if __name__ == "__main__":
+    builder = GNS3NetworkBuilder()
     builder.build_network()
\ No newline at end of file
@@ -0,0 +1,6 @@
+# Columns and labels shared by training, the feature store and inference
+FEATURE_COLUMNS = ['cpu_usage', 'memory_usage', 'bandwidth_mbps',
+                   'latency_ms', 'packet_loss_percent', 'error_rate_percent']
+LABEL_COLUMN = 'issue_detected'
+CLASSES = ['none', 'normal', 'high_cpu', 'high_memory', 'high_latency',
+           'packet_loss', 'bandwidth_saturation', 'high_errors', 'multiple_issues']
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+import numpy as np
+from dataset_schema import FEATURE_COLUMNS
+
+HISTOGRAM_BINS = 20         # Equal-width bins over training mean +/- HISTOGRAM_SPAN std, plus two overflow bins
+HISTOGRAM_SPAN = 4
+HALF_LIFE = 5000            # Samples after which old traffic weighs half as much
+MIN_SAMPLES = 100           # Groups with less weight than this are reported but not scored
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+MEAN_SHIFT_DRIFT = 0.5      # Training standard deviations
+VARIANCE_RATIO_DRIFT = 2.0  # Live variance this many times above or below the training variance
+EPSILON = 1e-6
+CACHED_REFERENCES = 2       # Models whose references are kept, so a swap back is free
+
+
+def _scaler_stats(scaler):
+    """Training mean and variance from a fitted StandardScaler or a NumpyScaler"""
+    if hasattr(scaler, 'var_'):
+        return np.asarray(scaler.mean_, dtype=float), np.asarray(scaler.var_, dtype=float)
+    return np.asarray(scaler.mean_, dtype=float), np.asarray(scaler.scale_, dtype=float) ** 2
+
+
+class DriftReference:
+    """Training-side statistics: scaler mean/variance and, given the training data, bin probabilities
+
+    Telemetry features are far from normal, so without the training histograms only the
+    moments are compared and PSI is left out.
+    """
+    def __init__(self, mean, var, histograms=None):
+        self.mean = mean
+        self.std = np.sqrt(np.maximum(var, EPSILON))
+        offsets = np.linspace(-HISTOGRAM_SPAN, HISTOGRAM_SPAN, HISTOGRAM_BINS + 1)
+        self.edges = self.mean[:, None] + offsets[None, :] * self.std[:, None]  # (features, bins + 1)
+        self.probabilities = None
+        if histograms is not None:
+            self.probabilities = histograms / histograms.sum(axis=1, keepdims=True)
+
+    @classmethod
+    def from_model(cls, model_data, store_path=None):
+        mean, var = _scaler_stats(model_data['scaler'])
+        reference = cls(mean, var)
+        if store_path and os.path.exists(os.path.join(store_path, 'schema.json')):
+            from feature_store import FeatureStore
+            counts = np.zeros((len(mean), HISTOGRAM_BINS + 2))
+            for X, _ in FeatureStore(store_path).iter_batches(1_000_000):
+                counts += reference.bin_counts(X)
+                time.sleep(0)  # Lets other green threads run between batches under eventlet
+            reference = cls(mean, var, counts + EPSILON)
+        return reference
+
+    def bin_counts(self, X):
+        """(features, bins + 2) counts, first and last bins catching everything outside the span"""
+        counts = np.empty((X.shape[1], HISTOGRAM_BINS + 2))
+        for j in range(X.shape[1]):
+            index = np.searchsorted(self.edges[j], X[:, j], side='right')
+            counts[j] = np.bincount(index, minlength=HISTOGRAM_BINS + 2)
+        return counts
+
+
+def _store_fingerprint(store_path):
+    try:
+        stat = os.stat(os.path.join(store_path, 'schema.json'))
+        return (os.path.abspath(store_path), stat.st_mtime, stat.st_size)
+    except (OSError, TypeError):
+        return None
+
+
+class ReferenceCache:
+    """Training references shared by every project, built once per model and store contents
+
+    Scanning the store is slow at scale, so it happens in build(), called from the model
+    registry before a model goes live, or from a background thread via prepare().
+    """
+    def __init__(self):
+        self.entries = {}  # (id(model_data), store fingerprint) -> (model_data, reference)
+        self.building = set()
+        self.lock = threading.Lock()
+
+    def get(self, model_data, store_path):
+        key = (id(model_data), _store_fingerprint(store_path))
+        with self.lock:
+            entry = self.entries.get(key)
+        # Identity check guards against ids reused by a garbage-collected model
+        return entry[1] if entry is not None and entry[0] is model_data else None
+
+    def build(self, model_data, store_path):
+        key = (id(model_data), _store_fingerprint(store_path))
+        reference = self.get(model_data, store_path)
+        if reference is None:
+            reference = DriftReference.from_model(model_data, store_path)
+            with self.lock:
+                self.entries[key] = (model_data, reference)
+                while len(self.entries) > CACHED_REFERENCES:
+                    del self.entries[next(iter(self.entries))]
+        return reference
+
+    def prepare(self, model_data, store_path):
+        """Build in the background unless a build for this model and store is already running"""
+        key = (id(model_data), _store_fingerprint(store_path))
+        with self.lock:
+            if key in self.building:
+                return
+            self.building.add(key)
+
+        def run():
+            try:
+                self.build(model_data, store_path)
+            except Exception as e:
+                print(f"Drift reference error: {str(e)}")
+            finally:
+                with self.lock:
+                    self.building.discard(key)
+        threading.Thread(target=run, name='drift-reference', daemon=True).start()
+
+
+REFERENCES = ReferenceCache()
+
+
+class StreamingStats:
+    """Exponentially forgetting Welford mean/variance and histogram of one device group"""
+    def __init__(self, n_features, n_bins):
+        self.weight = 0.0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.histogram = np.zeros((n_features, n_bins))
+
+    def update(self, X, counts):
+        n = len(X)
+        decay = 0.5 ** (n / HALF_LIFE)
+        self.weight *= decay
+        self.m2 *= decay
+        self.histogram *= decay
+
+        # Chan et al. merge of the batch into the running moments
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = self.weight + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta ** 2 * self.weight * n / total
+        self.weight = total
+        self.histogram += counts
+
+    @property
+    def var(self):
+        return self.m2 / self.weight if self.weight else np.zeros_like(self.m2)
+
+
+class DriftMonitor:
+    """Constant-memory comparison of live features per device group against the training data"""
+    def __init__(self, store_path=None, references=REFERENCES):
+        self.store_path = store_path
+        self.references = references
+        self.reference = None
+        self.model = None
+        self.groups = {}
+        self.lock = threading.Lock()
+
+    def update(self, features, groups, model_data):
+        """Fold one tick of readings in; groups gives each row's device group (e.g. node type)"""
+        features = np.asarray(features, dtype=float)
+        reference = self.references.get(model_data, self.store_path) if model_data else None
+        with self.lock:
+            if reference is None and model_data:
+                # Never scan the store on the tick; readings are skipped until the build lands
+                self.references.prepare(model_data, self.store_path)
+                if model_data is self.model:
+                    reference = self.reference  # Store rewritten; keep the previous reference meanwhile
+            self.model, self.reference = model_data, reference
+            if self.reference is None or not len(features):
+                return
+            groups = np.asarray(groups, dtype=object)
+            for group in ['all'] + sorted(set(groups)):
+                rows = features if group == 'all' else features[groups == group]
+                stats = self.groups.get(group)
+                if stats is None:
+                    stats = self.groups[group] = StreamingStats(len(FEATURE_COLUMNS), HISTOGRAM_BINS + 2)
+                stats.update(rows, self.reference.bin_counts(rows))
+
+    def scores(self, group=None):
+        """Per group: sample weight, status and per-feature mean shift, variance ratio and PSI"""
+        with self.lock:
+            if self.reference is None:
+                return {}
+            reference = self.reference
+            result = {}
+            for name, stats in self.groups.items():
+                if group is not None and name != group:
+                    continue
+                entry = {'samples': round(stats.weight, 1), 'status': 'insufficient_data', 'features': {}}
+                if stats.weight >= MIN_SAMPLES:
+                    shift = np.abs(stats.mean - reference.mean) / reference.std
+                    ratio = stats.var / reference.std ** 2
+                    psi = np.full(len(FEATURE_COLUMNS), np.nan)
+                    if reference.probabilities is not None:
+                        live = np.maximum(stats.histogram / stats.histogram.sum(axis=1, keepdims=True), EPSILON)
+                        psi = ((live - reference.probabilities) * np.log(live / reference.probabilities)).sum(axis=1)
+                    for j, column in enumerate(FEATURE_COLUMNS):
+                        entry['features'][column] = {
+                            'mean': float(stats.mean[j]), 'training_mean': float(reference.mean[j]),
+                            'mean_shift': float(shift[j]), 'variance_ratio': float(ratio[j]),
+                            'psi': None if np.isnan(psi[j]) else float(psi[j])
+                        }
+                    worst = None if np.isnan(psi).all() else float(np.nanmax(psi))
+                    entry['max_psi'] = worst
+                    moments_drifted = (shift.max() > MEAN_SHIFT_DRIFT
+                                       or (ratio > VARIANCE_RATIO_DRIFT).any()
+                                       or (ratio < 1 / VARIANCE_RATIO_DRIFT).any())
+                    if moments_drifted or (worst is not None and worst > PSI_DRIFT):
+                        entry['status'] = 'drift'
+                    elif worst is not None and worst > PSI_MODERATE:
+                        entry['status'] = 'moderate'
+                    else:
+                        entry['status'] = 'stable'
+                result[name] = entry
+            return result
@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TEMPLATES = [
+    {"name": "Ethernet switch", "template_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, "ethernet_switch")),
+     "template_type": "ethernet_switch"},
+    {"name": "VPCS", "template_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, "vpcs")),
+     "template_type": "vpcs"},
+]
+
+
+class FakeGNS3State:
+    """In-memory projects, nodes, links and node files behind the fake REST API"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.projects = {}
+        self.nodes = {}   # project_id -> {node_id: node}
+        self.links = {}   # project_id -> {link_id: link}
+        self.files = {}   # (project_id, node_id, path) -> bytes
+        self.request_count = 0
+
+    def add_project(self, name):
+        project_id = str(uuid.uuid4())
+        self.projects[project_id] = {"name": name, "project_id": project_id, "status": "opened"}
+        self.nodes[project_id] = {}
+        self.links[project_id] = {}
+        return self.projects[project_id]
+
+    def add_node(self, project_id, payload):
+        node_id = str(uuid.uuid4())
+        node = {
+            "node_id": node_id,
+            "project_id": project_id,
+            "name": payload["name"],
+            "node_type": payload.get("node_type", "vpcs"),
+            "template_id": payload.get("template_id"),
+            "compute_id": payload.get("compute_id", "local"),
+            "x": payload.get("x", 0),
+            "y": payload.get("y", 0),
+            "properties": payload.get("properties", {}),
+            "status": "started"
+        }
+        self.nodes[project_id][node_id] = node
+        return node
+
+    def add_link(self, project_id, payload):
+        link_id = str(uuid.uuid4())
+        link = {"link_id": link_id, "project_id": project_id, "nodes": payload["nodes"]}
+        self.links[project_id][link_id] = link
+        return link
+
+    def add_network(self, name, devices, pcs_per_switch=20):
+        """Create a project with a core switch, access switches and devices PCs, already linked"""
+        project = self.add_project(name)
+        project_id = project["project_id"]
+        core = self.add_node(project_id, {"name": "Core-Switch", "node_type": "ethernet_switch"})
+        switch = None
+        for i in range(devices):
+            if i % pcs_per_switch == 0:
+                number = i // pcs_per_switch + 1
+                switch = self.add_node(project_id, {"name": f"Access-Switch-{number}", "node_type": "ethernet_switch"})
+                self.add_link(project_id, {"nodes": [
+                    {"node_id": core["node_id"], "adapter_number": 0, "port_number": number},
+                    {"node_id": switch["node_id"], "adapter_number": 0, "port_number": 0}]})
+            pc = self.add_node(project_id, {"name": f"PC-{i + 1}"})
+            self.add_link(project_id, {"nodes": [
+                {"node_id": switch["node_id"], "adapter_number": 0, "port_number": i % pcs_per_switch + 1},
+                {"node_id": pc["node_id"], "adapter_number": 0, "port_number": 0}]})
+        return project
+
+
+class FakeGNS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        ("GET", r"/v2/version$", "get_version"),
+        ("GET", r"/v2/templates$", "get_templates"),
+        ("GET", r"/v2/projects$", "get_projects"),
+        ("POST", r"/v2/projects$", "post_project"),
+        ("GET", r"/v2/projects/(?P<project_id>[^/]+)$", "get_project"),
+        ("DELETE", r"/v2/projects/(?P<project_id>[^/]+)$", "delete_project"),
+        ("POST", r"/v2/projects/(?P<project_id>[^/]+)/open$", "open_project"),
+        ("GET", r"/v2/projects/(?P<project_id>[^/]+)/nodes$", "get_nodes"),
+        ("POST", r"/v2/projects/(?P<project_id>[^/]+)/nodes$", "post_node"),
+        ("GET", r"/v2/projects/(?P<project_id>[^/]+)/nodes/(?P<node_id>[^/]+)$", "get_node"),
+        ("PUT", r"/v2/projects/(?P<project_id>[^/]+)/nodes/(?P<node_id>[^/]+)$", "put_node"),
+        ("DELETE", r"/v2/projects/(?P<project_id>[^/]+)/nodes/(?P<node_id>[^/]+)$", "delete_node"),
+        ("GET", r"/v2/projects/(?P<project_id>[^/]+)/nodes/(?P<node_id>[^/]+)/files/(?P<path>.+)$", "get_file"),
+        ("POST", r"/v2/projects/(?P<project_id>[^/]+)/nodes/(?P<node_id>[^/]+)/files/(?P<path>.+)$", "post_file"),
+        ("GET", r"/v2/projects/(?P<project_id>[^/]+)/links$", "get_links"),
+        ("POST", r"/v2/projects/(?P<project_id>[^/]+)/links$", "post_link"),
+        ("DELETE", r"/v2/projects/(?P<project_id>[^/]+)/links/(?P<link_id>[^/]+)$", "delete_link"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, raw=None):
+        data = raw if raw is not None else (json.dumps(body).encode() if body is not None else b"")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        server = self.server
+        with server.state.lock:
+            server.state.request_count += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if server.failure_rate and random.random() < server.failure_rate:
+            return self._send(503, {"message": "Simulated transient failure"})
+
+        path = self.path.split("?", 1)[0]
+        for route_method, pattern, handler in self.ROUTES:
+            match = re.match(pattern, path)
+            if route_method == method and match:
+                with server.state.lock:
+                    return getattr(self, handler)(server.state, **match.groupdict())
+        self._send(404, {"message": f"Unknown route {method} {path}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _json(self):
+        return json.loads(self.body or b"{}")
+
+    def get_version(self, state):
+        self._send(200, {"version": "2.2.0-fake", "local": True})
+
+    def get_templates(self, state):
+        self._send(200, TEMPLATES)
+
+    def get_projects(self, state):
+        self._send(200, list(state.projects.values()))
+
+    def post_project(self, state):
+        payload = self._json()
+        if any(p["name"] == payload["name"] for p in state.projects.values()):
+            return self._send(409, {"message": f"Project '{payload['name']}' already exists"})
+        self._send(201, state.add_project(payload["name"]))
+
+    def get_project(self, state, project_id):
+        if project_id not in state.projects:
+            return self._send(404, {"message": "Project not found"})
+        self._send(200, state.projects[project_id])
+
+    def open_project(self, state, project_id):
+        if project_id not in state.projects:
+            return self._send(404, {"message": "Project not found"})
+        state.projects[project_id]["status"] = "opened"
+        self._send(201, state.projects[project_id])
+
+    def delete_project(self, state, project_id):
+        if state.projects.pop(project_id, None) is None:
+            return self._send(404, {"message": "Project not found"})
+        state.nodes.pop(project_id, None)
+        state.links.pop(project_id, None)
+        self._send(204)
+
+    def get_nodes(self, state, project_id):
+        if project_id not in state.projects:
+            return self._send(404, {"message": "Project not found"})
+        self._send(200, list(state.nodes[project_id].values()))
+
+    def post_node(self, state, project_id):
+        if project_id not in state.projects:
+            return self._send(404, {"message": "Project not found"})
+        self._send(201, state.add_node(project_id, self._json()))
+
+    def get_node(self, state, project_id, node_id):
+        node = state.nodes.get(project_id, {}).get(node_id)
+        if node is None:
+            return self._send(404, {"message": "Node not found"})
+        self._send(200, node)
+
+    def put_node(self, state, project_id, node_id):
+        node = state.nodes.get(project_id, {}).get(node_id)
+        if node is None:
+            return self._send(404, {"message": "Node not found"})
+        node.update({k: v for k, v in self._json().items() if k in ("name", "x", "y", "properties")})
+        self._send(200, node)
+
+    def delete_node(self, state, project_id, node_id):
+        if state.nodes.get(project_id, {}).pop(node_id, None) is None:
+            return self._send(404, {"message": "Node not found"})
+        links = state.links[project_id]
+        for link_id in [l for l, link in links.items() if any(n["node_id"] == node_id for n in link["nodes"])]:
+            del links[link_id]
+        self._send(204)
+
+    def get_file(self, state, project_id, node_id, path):
+        data = state.files.get((project_id, node_id, path))
+        if data is None:
+            return self._send(404, {"message": "File not found"})
+        self._send(200, raw=data)
+
+    def post_file(self, state, project_id, node_id, path):
+        if node_id not in state.nodes.get(project_id, {}):
+            return self._send(404, {"message": "Node not found"})
+        state.files[(project_id, node_id, path)] = self.body
+        self._send(201)
+
+    def get_links(self, state, project_id):
+        if project_id not in state.projects:
+            return self._send(404, {"message": "Project not found"})
+        self._send(200, list(state.links[project_id].values()))
+
+    def post_link(self, state, project_id):
+        payload = self._json()
+        nodes = state.nodes.get(project_id, {})
+        if any(n["node_id"] not in nodes for n in payload.get("nodes", [])):
+            return self._send(404, {"message": "Link endpoint not found"})
+        used = {(n["node_id"], n["adapter_number"], n["port_number"])
+                for link in state.links[project_id].values() for n in link["nodes"]}
+        if any((n["node_id"], n["adapter_number"], n["port_number"]) in used for n in payload["nodes"]):
+            return self._send(409, {"message": "Port is already used"})
+        self._send(201, state.add_link(project_id, payload))
+
+    def delete_link(self, state, project_id, link_id):
+        if state.links.get(project_id, {}).pop(link_id, None) is None:
+            return self._send(404, {"message": "Link not found"})
+        self._send(204)
+
+
+class FakeGNS3Server(ThreadingHTTPServer):
+    """Local stand-in for the GNS3 v2 REST API with configurable latency and failures"""
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, failure_rate=0.0):
+        super().__init__((host, port), FakeGNS3Handler)
+        self.state = FakeGNS3State()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def benchmark_build(devices, latency, workers):
+    """Build the same topology sequentially and in parallel against fresh fake servers"""
+    from create_nw import CONFIG_MANIFEST, TOPOLOGY_FILE, GNS3NetworkBuilder
+
+    results = {}
+    for mode, count in (("sequential", 1), ("parallel", workers)):
+        server = FakeGNS3Server(latency=latency).start()
+        try:
+            # Scratch files, so the user's own config_manifest.json and topology.json are left alone
+            with tempfile.TemporaryDirectory() as tmp:
+                builder = GNS3NetworkBuilder(server=server.url, target_devices=devices,
+                                             manifest_path=os.path.join(tmp, CONFIG_MANIFEST),
+                                             topology_path=os.path.join(tmp, TOPOLOGY_FILE))
+                start = time.perf_counter()
+                builder.build_network(workers=count)
+                results[mode] = time.perf_counter() - start
+        finally:
+            server.stop()
+    print(f"\n{devices} devices at {latency * 1000:.0f} ms latency: "
+          f"sequential {results['sequential']:.2f}s, parallel ({workers} workers) {results['parallel']:.2f}s, "
+          f"speedup {results['sequential'] / results['parallel']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local fake GNS3 server")
+    parser.add_argument("--port", type=int, default=3080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--benchmark", action="store_true", help="Compare sequential and parallel builds")
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_build(args.devices, args.latency, args.workers)
+    else:
+        server = FakeGNS3Server(port=args.port, latency=args.latency, failure_rate=args.failure_rate)
+        print(f"Fake GNS3 server listening on {server.url}")
+        server.serve_forever()
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from dataset_schema import FEATURE_COLUMNS, LABEL_COLUMN, CLASSES
+
+STORE_VERSION = 1
+FEATURE_DTYPE = 'float32'
+LABEL_DTYPE = 'int8'
+CHUNK_ROWS = 500_000
+SCHEMA_FILE = 'schema.json'
+
+
+def _file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _column_path(store_dir, column, dtype):
+    return os.path.join(store_dir, f"{column}.{dtype}")
+
+
+def encode_labels(labels):
+    """Map label strings to int8 class codes in one vectorized pass"""
+    codes = pd.Categorical(labels, categories=CLASSES).codes
+    if (codes < 0).any():
+        unknown = sorted(set(labels[codes < 0]))
+        raise ValueError(f"Labels {unknown} not in model's classes list")
+    return codes.astype(LABEL_DTYPE)
+
+
+class StoreWriter:
+    """Appends chunks of feature and label columns to a new store; close() writes the header"""
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        # Without a header the store stays unusable until writing completes
+        if os.path.exists(os.path.join(store_dir, SCHEMA_FILE)):
+            os.remove(os.path.join(store_dir, SCHEMA_FILE))
+        self.outputs = {col: open(_column_path(store_dir, col, FEATURE_DTYPE), 'wb') for col in FEATURE_COLUMNS}
+        self.outputs[LABEL_COLUMN] = open(_column_path(store_dir, LABEL_COLUMN, LABEL_DTYPE), 'wb')
+        self.rows = 0
+
+    def write(self, chunk):
+        """Append a DataFrame holding FEATURE_COLUMNS and LABEL_COLUMN"""
+        for col in FEATURE_COLUMNS:
+            self.outputs[col].write(chunk[col].to_numpy(dtype=FEATURE_DTYPE).tobytes())
+        self.outputs[LABEL_COLUMN].write(encode_labels(chunk[LABEL_COLUMN].to_numpy()).tobytes())
+        self.rows += len(chunk)
+
+    def abort(self):
+        for f in self.outputs.values():
+            f.close()
+
+    def close(self, source):
+        """Finish the column files and write the schema header; source describes where rows came from"""
+        self.abort()
+        schema = {
+            'version': STORE_VERSION,
+            'rows': self.rows,
+            'features': {col: FEATURE_DTYPE for col in FEATURE_COLUMNS},
+            'label': {LABEL_COLUMN: LABEL_DTYPE},
+            'classes': CLASSES,
+            'source': source
+        }
+        with open(os.path.join(self.store_dir, SCHEMA_FILE), 'w') as f:
+            json.dump(schema, f, indent=2)
+        return FeatureStore(self.store_dir)
+
+
+def convert_csv(csv_path, store_dir, chunksize=CHUNK_ROWS):
+    """Convert a telemetry CSV into memory-mappable column files plus a schema header"""
+    dtypes = {col: 'float64' for col in FEATURE_COLUMNS}
+    dtypes[LABEL_COLUMN] = 'object'
+
+    writer = StoreWriter(store_dir)
+    try:
+        reader = pd.read_csv(csv_path, usecols=FEATURE_COLUMNS + [LABEL_COLUMN],
+                             dtype=dtypes, chunksize=chunksize)
+        for chunk in reader:
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+
+    store = writer.close({
+        'path': os.path.abspath(csv_path),
+        'size': os.path.getsize(csv_path),
+        'mtime': os.path.getmtime(csv_path),
+        'sha256': _file_sha256(csv_path)
+    })
+    print(f"Converted {writer.rows} rows from {csv_path} into {store_dir}")
+    return store
+
+
+class FeatureStore:
+    """Zero-copy, memory-mapped view of a converted telemetry dataset"""
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, SCHEMA_FILE)) as f:
+            self.schema = json.load(f)
+        self.verify_schema()
+
+        self.rows = self.schema['rows']
+        self.columns = {
+            col: np.memmap(_column_path(store_dir, col, FEATURE_DTYPE), dtype=FEATURE_DTYPE,
+                           mode='r', shape=(self.rows,))
+            for col in FEATURE_COLUMNS
+        }
+        self.labels = np.memmap(_column_path(store_dir, LABEL_COLUMN, LABEL_DTYPE), dtype=LABEL_DTYPE,
+                                mode='r', shape=(self.rows,))
+
+    def verify_schema(self):
+        """Check the header against the columns, dtypes and classes the models expect"""
+        schema = self.schema
+        if schema.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported feature store version {schema.get('version')}")
+        if list(schema['features']) != FEATURE_COLUMNS:
+            raise ValueError(f"Feature columns {list(schema['features'])} do not match {FEATURE_COLUMNS}")
+        for col, dtype in schema['features'].items():
+            if dtype != FEATURE_DTYPE:
+                raise ValueError(f"Column {col} has wrong dtype. Expected {FEATURE_DTYPE}, got {dtype}")
+        if schema['label'] != {LABEL_COLUMN: LABEL_DTYPE}:
+            raise ValueError(f"Label column {schema['label']} does not match {LABEL_COLUMN}:{LABEL_DTYPE}")
+        if schema['classes'] != CLASSES:
+            raise ValueError(f"Store classes {schema['classes']} do not match model classes {CLASSES}")
+
+        expected = {col: schema['rows'] * np.dtype(FEATURE_DTYPE).itemsize for col in FEATURE_COLUMNS}
+        expected[LABEL_COLUMN] = schema['rows'] * np.dtype(LABEL_DTYPE).itemsize
+        for col, size in expected.items():
+            dtype = LABEL_DTYPE if col == LABEL_COLUMN else FEATURE_DTYPE
+            actual = os.path.getsize(_column_path(self.store_dir, col, dtype))
+            if actual != size:
+                raise ValueError(f"Column file for {col} is {actual} bytes, expected {size}")
+
+    def is_stale(self, csv_path):
+        """True when the CSV no longer matches the fingerprint the store was built from
+
+        Stores written without a CSV (e.g. by synthetic_telemetry) have no fingerprint and
+        are never stale: they are used as they are rather than overwritten.
+        """
+        source = self.schema.get('source') or {}
+        if not {'size', 'mtime', 'sha256'} <= set(source):
+            print(f"Feature store {self.store_dir} was not converted from a CSV; using it as is")
+            return False
+        if os.path.getsize(csv_path) != source['size']:
+            return True
+        if os.path.getmtime(csv_path) == source['mtime']:
+            return False
+        return _file_sha256(csv_path) != source['sha256']
+
+    def features(self, start=0, stop=None):
+        """Row-major (n, 6) feature matrix for a row range; only this slice is copied"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        return np.column_stack([self.columns[col][start:stop] for col in FEATURE_COLUMNS])
+
+    def iter_batches(self, batch_size):
+        for start in range(0, self.rows, batch_size):
+            yield self.features(start, start + batch_size), self.labels[start:start + batch_size]
+
+
+def open_feature_store(path, csv_path=None):
+    """Open a store, (re)building it from csv_path first when missing or out of date"""
+    if csv_path and (not os.path.exists(os.path.join(path, SCHEMA_FILE)) or FeatureStore(path).is_stale(csv_path)):
+        return convert_csv(csv_path, path)
+    return FeatureStore(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert telemetry CSV into a memory-mapped feature store")
+    parser.add_argument('csv_path')
+    parser.add_argument('store_dir')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    convert_csv(args.csv_path, args.store_dir, args.chunksize)
@@ -0,0 +1,170 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning, NewConnectionError
+
+requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
+
+GNS3_SERVER = "http://localhost:3080"
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+POOL_SIZE = 32
+RETRIES = 3
+BACKOFF = 0.5  # Seconds, doubled after every failed attempt
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+# A POST may already have taken effect unless the server said it was refused
+NOT_APPLIED_STATUS = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Cache lifetimes in seconds
+TEMPLATES_TTL = 300
+PROJECTS_TTL = 30
+NODES_TTL = 2
+LINKS_TTL = 30
+
+
+class GNS3Error(Exception):
+    pass
+
+
+def _never_sent(error):
+    """Whether a failed request never reached the server, so resending it can't duplicate anything"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class TTLCache:
+    """Thread-safe cache whose entries expire a fixed number of seconds after being stored"""
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader()
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+class GNS3Client:
+    """Pooled, keep-alive GNS3 v2 API client with retries and TTL caches for metadata"""
+    def __init__(self, server=GNS3_SERVER, pool_size=POOL_SIZE, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 retries=RETRIES, backoff=BACKOFF):
+        self.server = server.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.request_count = 0
+        self.count_lock = threading.Lock()
+        self.templates_cache = TTLCache(TEMPLATES_TTL)
+        self.projects_cache = TTLCache(PROJECTS_TTL)
+        self.nodes_cache = TTLCache(NODES_TTL)
+        self.links_cache = TTLCache(LINKS_TTL)
+
+    def request(self, method, path, **kwargs):
+        """Send a request, retrying connection errors and transient statuses with backoff
+
+        Non-idempotent requests (node and link creation) are only retried when the server
+        can't have acted on them: the connection never opened, or it answered 429/503.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_status = TRANSIENT_STATUS if idempotent else NOT_APPLIED_STATUS
+        for attempt in range(self.retries + 1):
+            with self.count_lock:
+                self.request_count += 1
+            try:
+                response = self.session.request(method, self.server + path, **kwargs)
+                if response.status_code not in retry_status or attempt == self.retries:
+                    break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries or not (idempotent or _never_sent(e)):
+                    raise
+            time.sleep(self.backoff * 2 ** attempt)
+
+        if method != "GET":
+            self._invalidate_for(path)
+        return response
+
+    def get_json(self, path):
+        response = self.request("GET", path)
+        if response.status_code != 200:
+            raise GNS3Error(f"GET {path} failed with {response.status_code}: {response.text}")
+        return response.json()
+
+    def _invalidate_for(self, path):
+        """Drop cached metadata that a write to path may have changed"""
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["v2", "projects"]:
+            return
+        if len(parts) <= 3 or parts[3] in ("open", "close"):
+            self.projects_cache.invalidate()
+        if len(parts) >= 3:
+            self.invalidate(parts[2])
+
+    def invalidate(self, project_id=None):
+        """Explicitly forget cached nodes and links for one project, or everything"""
+        self.nodes_cache.invalidate(project_id)
+        self.links_cache.invalidate(project_id)
+        if project_id is None:
+            self.projects_cache.invalidate()
+            self.templates_cache.invalidate()
+
+    def templates(self):
+        return self.templates_cache.get_or_load("templates", lambda: self.get_json("/v2/templates"))
+
+    def template_id(self, template_name):
+        for template in self.templates():
+            if template["name"].lower() == template_name.lower():
+                return template["template_id"]
+        raise GNS3Error(f"Template '{template_name}' not found")
+
+    def projects(self):
+        return self.projects_cache.get_or_load("projects", lambda: self.get_json("/v2/projects"))
+
+    def project_id(self, project_name):
+        """Look up a project id by name, or None when no such project exists"""
+        ids = self.projects_cache.get_or_load(
+            "ids", lambda: {p["name"]: p["project_id"] for p in self.projects()}
+        )
+        return ids.get(project_name)
+
+    def nodes(self, project_id, fresh=False):
+        if fresh:
+            self.nodes_cache.invalidate(project_id)
+        return self.nodes_cache.get_or_load(
+            project_id, lambda: self.get_json(f"/v2/projects/{project_id}/nodes")
+        )
+
+    def links(self, project_id, fresh=False):
+        if fresh:
+            self.links_cache.invalidate(project_id)
+        return self.links_cache.get_or_load(
+            project_id, lambda: self.get_json(f"/v2/projects/{project_id}/links")
+        )
@@ -0,0 +1,201 @@
+import threading
+import numpy as np
+
+HISTORY_METRICS = ['cpu', 'memory', 'bandwidth', 'latency', 'packet_loss', 'errors', 'prediction']
+PREDICTION = HISTORY_METRICS.index('prediction')
+
+# (name, bucket seconds, slots): raw ticks for 30 min, 1-minute means for a day, hourly for two weeks
+TIERS = [('raw', 0, 600), ('1m', 60, 1440), ('1h', 3600, 336)]
+MAX_DEVICES = 5000  # Device rows across every history sharing a quota; ~67 KB each with TIERS
+INITIAL_DEVICES = 64
+
+
+class DeviceQuota:
+    """Device rows shared by several histories (one per project), bounding their memory together"""
+    def __init__(self, max_devices=MAX_DEVICES):
+        self.max_devices = max_devices
+        self.available = max_devices
+        self.lock = threading.Lock()
+
+    def take(self, rows):
+        with self.lock:
+            granted = max(min(rows, self.available), 0)
+            self.available -= granted
+            return granted
+
+    def release(self, rows):
+        with self.lock:
+            self.available += rows
+
+
+class RingTier:
+    """Fixed-size ring of (slot, device, metric) samples with one timestamp per slot"""
+    def __init__(self, name, bucket, slots, capacity, n_metrics):
+        self.name = name
+        self.bucket = bucket
+        self.slots = slots
+        self.times = np.zeros(slots)
+        self.values = np.full((slots, capacity, n_metrics), np.nan, dtype=np.float32)
+        self.head = 0
+        self.count = 0
+
+    def grow(self, capacity):
+        values = np.full((self.slots, capacity, self.values.shape[2]), np.nan, dtype=np.float32)
+        values[:, :self.values.shape[1]] = self.values
+        self.values = values
+
+    def append(self, timestamp, row):
+        self.times[self.head] = timestamp
+        self.values[self.head] = row
+        self.head = (self.head + 1) % self.slots
+        self.count = min(self.count + 1, self.slots)
+
+    def ordered_slots(self):
+        return (self.head - self.count + np.arange(self.count)) % self.slots
+
+    def range(self, start, end):
+        """Slot indices covering [start, end], oldest first"""
+        order = self.ordered_slots()
+        times = self.times[order]
+        lo, hi = np.searchsorted(times, start, 'left'), np.searchsorted(times, end, 'right')
+        return order[lo:hi]
+
+
+class Rollup:
+    """Accumulates raw samples into one bucket of a downsampled tier"""
+    def __init__(self, tier, capacity, n_metrics):
+        self.tier = tier
+        self.bucket_start = None
+        self.sums = np.zeros((capacity, n_metrics))
+        self.counts = np.zeros((capacity, n_metrics))
+        self.last_prediction = np.full(capacity, np.nan)
+
+    def grow(self, capacity):
+        for name in ('sums', 'counts'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, old.shape[1]))
+            new[:len(old)] = old
+            setattr(self, name, new)
+        last = np.full(capacity, np.nan)
+        last[:len(self.last_prediction)] = self.last_prediction
+        self.last_prediction = last
+
+    def add(self, timestamp, rows, matrix):
+        bucket_start = timestamp - timestamp % self.tier.bucket
+        if self.bucket_start is not None and bucket_start != self.bucket_start:
+            self.flush()
+        self.bucket_start = bucket_start
+
+        present = ~np.isnan(matrix)
+        self.sums[rows] += np.where(present, matrix, 0)
+        self.counts[rows] += present
+        seen = present[:, PREDICTION]
+        self.last_prediction[rows[seen]] = matrix[seen, PREDICTION]
+
+    def flush(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (self.sums / self.counts).astype(np.float32)
+        # Class codes don't average; keep the latest prediction of the bucket instead
+        means[:, PREDICTION] = self.last_prediction
+        self.tier.append(self.bucket_start, means)
+        self.sums[:] = 0
+        self.counts[:] = 0
+        self.last_prediction[:] = np.nan
+
+
+class MetricHistory:
+    """Bounded in-process time series per device and metric, with raw -> 1 min -> 1 h rollups"""
+    def __init__(self, max_devices=MAX_DEVICES, tiers=TIERS, quota=None):
+        self.max_devices = max_devices
+        self.quota = quota or DeviceQuota(max_devices)
+        self.capacity = self.quota.take(min(INITIAL_DEVICES, max_devices))
+        self.closed = False
+        self.devices = {}
+        self.dropped = set()
+        self.lock = threading.Lock()
+        n_metrics = len(HISTORY_METRICS)
+        self.tiers = {name: RingTier(name, bucket, slots, self.capacity, n_metrics)
+                      for name, bucket, slots in tiers}
+        self.rollups = [Rollup(tier, self.capacity, n_metrics) for tier in self.tiers.values() if tier.bucket]
+
+    def _rows(self, device_names):
+        rows = np.empty(len(device_names), dtype=np.intp)
+        for i, name in enumerate(device_names):
+            row = self.devices.get(name)
+            if row is None:
+                if len(self.devices) >= self.capacity and not self._grow(len(self.devices) + 1):
+                    # One line when the history fills up, not one per device it turns away
+                    if not self.dropped:
+                        print(f"History full ({self.capacity} devices), not recording {name} or later devices")
+                    self.dropped.add(name)
+                    row = -1
+                else:
+                    row = self.devices[name] = len(self.devices)
+            rows[i] = row
+        return rows
+
+    def _grow(self, needed):
+        """Double the capacity (or more, up to needed) with rows from the quota; False if none are left"""
+        if self.closed:
+            return False
+        target = min(max(self.capacity * 2, needed), self.max_devices)
+        granted = self.quota.take(target - self.capacity)
+        if not granted:
+            return False
+        capacity = self.capacity + granted
+        for tier in self.tiers.values():
+            tier.grow(capacity)
+        for rollup in self.rollups:
+            rollup.grow(capacity)
+        self.capacity = capacity
+        return capacity >= needed
+
+    def close(self):
+        """Hand this history's rows back to the quota; it records nothing new afterwards"""
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.quota.release(self.capacity)
+
+    def record(self, timestamp, device_names, matrix):
+        """Store one (n_devices, len(HISTORY_METRICS)) sample matrix taken at timestamp"""
+        with self.lock:
+            rows = self._rows(device_names)
+            keep = rows >= 0
+            rows, matrix = rows[keep], np.asarray(matrix, dtype=np.float64)[keep]
+
+            raw = np.full((self.capacity, len(HISTORY_METRICS)), np.nan, dtype=np.float32)
+            raw[rows] = matrix
+            self.tiers['raw'].append(timestamp, raw)
+            for rollup in self.rollups:
+                rollup.add(timestamp, rows, matrix)
+
+    def query(self, device, start, end, resolution='auto', metrics=HISTORY_METRICS):
+        """Samples for one device between two epoch timestamps, oldest first"""
+        with self.lock:
+            row = self.devices.get(device)
+            if row is None:
+                return None
+            if resolution == 'auto':
+                resolution = self._resolution_for(start)
+            tier = self.tiers[resolution]
+            slots = tier.range(start, end)
+            columns = [HISTORY_METRICS.index(m) for m in metrics]
+            values = tier.values[slots, row][:, columns]
+            return {
+                'resolution': resolution,
+                'timestamps': tier.times[slots].tolist(),
+                'metrics': {m: values[:, i] for i, m in enumerate(metrics)}
+            }
+
+    def _resolution_for(self, start):
+        """Finest tier whose retained window reaches back to start, else the one reaching furthest"""
+        oldest = {name: tier.times[tier.ordered_slots()[0]] for name, tier in self.tiers.items() if tier.count}
+        for name, first in oldest.items():
+            if first <= start:
+                return name
+        return min(oldest, key=oldest.get) if oldest else 'raw'
+
+    def memory_bytes(self):
+        total = sum(t.values.nbytes + t.times.nbytes for t in self.tiers.values())
+        return total + sum(r.sums.nbytes + r.counts.nbytes + r.last_prediction.nbytes for r in self.rollups)
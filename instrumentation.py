@@ -0,0 +1,150 @@
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from sub-millisecond numpy work to multi-second GNS3 stalls
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PROFILE_INTERVAL = 0.01  # Seconds between profiler samples
+PROFILE_DEPTH = 40       # Innermost frames kept per sampled stack
+
+try:
+    # The sampler must stay a real OS thread when the app runs monkey-patched under
+    # eventlet; a green one would only ever see its own stack
+    from eventlet.patcher import original
+    _threading, _time = original('threading'), original('time')
+except ImportError:
+    _threading, _time = threading, time
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in sorted(labels.items())) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, as Prometheus expects"""
+    def __init__(self, name, help, buckets=STAGE_BUCKETS, label='stage'):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.label = label
+        self.series = {}  # label value -> [bucket counts, sum, count]
+
+    def observe(self, label_value, value):
+        series = self.series.get(label_value)
+        if series is None:
+            series = self.series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for label_value, (counts, total, count) in sorted(self.series.items()):
+            for bound, n in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{_labels({self.label: label_value, "le": bound})} {n}')
+            lines.append(f'{self.name}_bucket{_labels({self.label: label_value, "le": "+Inf"})} {count}')
+            lines.append(f'{self.name}_sum{_labels({self.label: label_value})} {total:.6f}')
+            lines.append(f'{self.name}_count{_labels({self.label: label_value})} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Stage timings, counters and sampled gauges rendered in Prometheus text format"""
+    def __init__(self, prefix='qiai'):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.stages = Histogram(f'{prefix}_stage_seconds', 'Time spent per monitor pipeline stage')
+        self.counters = {}   # (name, labels) -> value
+        self.help = {}
+        self.gauges = {}     # name -> (help, callable returning a number)
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            self.stages.observe(stage, seconds)
+
+    def inc(self, name, value=1, help='', **labels):
+        key = (f'{self.prefix}_{name}', tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+            self.help.setdefault(key[0], help)
+
+    def gauge(self, name, help, read):
+        """Register a gauge whose value is read when /metrics is scraped"""
+        self.gauges[f'{self.prefix}_{name}'] = (help, read)
+
+    def render(self):
+        with self.lock:
+            lines = self.stages.render()
+            by_name = {}
+            for (name, labels), value in self.counters.items():
+                by_name.setdefault(name, []).append((dict(labels), value))
+            for name, series in sorted(by_name.items()):
+                lines += [f'# HELP {name} {self.help[name]}', f'# TYPE {name} counter']
+                lines += [f'{name}{_labels(labels)} {value}' for labels, value in series]
+        for name, (help, read) in sorted(self.gauges.items()):
+            try:
+                value = read()
+            except Exception as e:
+                print(f"Gauge {name} error: {str(e)}")
+                continue
+            lines += [f'# HELP {name} {help}', f'# TYPE {name} gauge', f'{name} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """Samples the stacks of all other threads from a daemon thread, in collapsed-stack format"""
+    def __init__(self, interval=PROFILE_INTERVAL, depth=PROFILE_DEPTH):
+        self.interval = interval
+        self.depth = depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return
+        self.stacks.clear()
+        self.samples = 0
+        self.running = True
+        self.thread = _threading.Thread(target=self._run, name='profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        me = _threading.get_ident()
+        while self.running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                names = []
+                while frame is not None and len(names) < self.depth:
+                    code = frame.f_code
+                    names.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+            _time.sleep(self.interval)
+
+    def collapsed(self, limit=None):
+        """Stacks as 'outer;...;inner count' lines, most frequent first (flamegraph.pl input)"""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common(limit)) + '\n'
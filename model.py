@@ -1,141 +1,226 @@
-# import pandas as pd
-# import numpy as np
-# from sklearn.preprocessing import StandardScaler
-# from tensorflow.keras.models import Sequential
-# from tensorflow.keras.layers import Dense
-# from tensorflow.keras.optimizers import Adam
-# from joblib import dump
-
-# class AINetworkMonitor:
-#     def __init__(self):
-#         self.scaler = StandardScaler()
-#         # Updated to include 'none' and match your dataset
-#         self.classes = ['none', 'normal', 'high_cpu', 'high_memory', 'high_latency',
-#                        'packet_loss', 'bandwidth_saturation', 'high_errors', 'multiple_issues']
-        
-#     def verify_dataset(self, df):
-#         required_columns = {
-#             'cpu_usage': 'float64',
-#             'memory_usage': 'float64',
-#             'bandwidth_mbps': 'float64',
-#             'latency_ms': 'float64',
-#             'packet_loss_percent': 'float64',
-#             'error_rate_percent': 'float64',
-#             'issue_detected': 'object'
-#         }
-        
-#         for col, dtype in required_columns.items():
-#             if col not in df.columns:
-#                 raise ValueError(f"Missing column: {col}")
-#             if df[col].dtype != dtype:
-#                 raise ValueError(f"Column {col} has wrong dtype. Expected {dtype}, got {df[col].dtype}")
-        
-#         # Additional check for labels
-#         unique_labels = df['issue_detected'].unique()
-#         for label in unique_labels:
-#             if label not in self.classes:
-#                 raise ValueError(f"Label '{label}' not in model's classes list")
-        
-#         print("Dataset validation passed!")
-
-#     def build_model(self):
-#         model = Sequential([
-#             Dense(64, activation='relu', input_dim=6),
-#             Dense(32, activation='relu'),
-#             Dense(len(self.classes), activation='softmax')  # Now matches all possible labels
-#         ])
-#         model.compile(optimizer=Adam(0.001),
-#                     loss='sparse_categorical_crossentropy',
-#                     metrics=['accuracy'])
-#         return model
-
-#     def train(self, data_path='network_performance_dataset.csv'):
-#         df = pd.read_csv(data_path)
-#         self.verify_dataset(df)
-        
-#         X = df[['cpu_usage', 'memory_usage', 'bandwidth_mbps',
-#                 'latency_ms', 'packet_loss_percent', 'error_rate_percent']]
-#         y = df['issue_detected'].apply(lambda x: self.classes.index(x))
-        
-#         X = self.scaler.fit_transform(X)
-#         self.model = self.build_model()
-#         self.model.fit(X, y, epochs=20, batch_size=32, validation_split=0.2)
-        
-#         dump({'model': self.model, 'scaler': self.scaler, 'classes': self.classes}, 
-#              'network_ai.joblib')
-#         print(f"Model trained and saved! Classes: {self.classes}")
-
-# if __name__ == "__main__":
-#     monitor = AINetworkMonitor()
-#     monitor.train()
-
-
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, Lambda
-from tensorflow.keras.optimizers import Adam
-from joblib import dump
-import tensorflow as tf
-
-class QuantumInspiredMonitor:
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.classes = ['none', 'normal', 'high_cpu', 'high_memory', 'high_latency', 
-                        'packet_loss', 'bandwidth_saturation', 'high_errors', 'multiple_issues']
-    
-    def _quantum_inspired_layer(self, x):
-        """Classical approximation of quantum operations"""
-        # Quantum-inspired rotation (using classical trigonometry)
-        sin_trans = tf.math.sin(x * np.pi)  # Simulates quantum rotations
-        cos_trans = tf.math.cos(x * np.pi)
-        
-        # Entanglement simulation (non-linear mixing)
-        entangled = tf.multiply(sin_trans, cos_trans)
-        return entangled
-    
-    def build_model(self):
-        model = Sequential([
-            # Classical input
-            Dense(64, activation='relu', input_dim=6),
-            
-            # Quantum-inspired transformations
-            Lambda(self._quantum_inspired_layer),
-            Dense(32, activation='relu'),
-            
-            # Output with quantum-inspired interference
-            Dense(len(self.classes), 
-                  activation=lambda x: tf.math.abs(x)  # Probability-like output
-            )
-        ])
-        
-        model.compile(
-            optimizer=Adam(0.001),
-            loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
-        )
-        return model
-
-    def train(self, data_path):
-        df = pd.read_csv(data_path)
-        X = df[['cpu_usage', 'memory_usage', 'bandwidth_mbps',
-                'latency_ms', 'packet_loss_percent', 'error_rate_percent']]
-        y = df['issue_detected'].apply(lambda x: self.classes.index(x))
-        
-        X = self.scaler.fit_transform(X)
-        self.model = self.build_model()
-        
-        self.model.fit(X, y, epochs=50, batch_size=32, validation_split=0.2)
-        
-        dump({
-            'model': self.model,
-            'scaler': self.scaler,
-            'classes': self.classes
-        }, 'quantum_inspired_network.joblib')
-        
-        print("Quantum-inspired (classical) model trained and saved!")
-
-if __name__ == "__main__":
-    monitor = QuantumInspiredMonitor()
-    monitor.train('network_performance_dataset.csv')
\ No newline at end of file
+# import pandas as pd
+# import numpy as np
+# from sklearn.preprocessing import StandardScaler
+# from tensorflow.keras.models import Sequential
+# from tensorflow.keras.layers import Dense
+# from tensorflow.keras.optimizers import Adam
+# from joblib import dump
+
+# class AINetworkMonitor:
+#     def __init__(self):
+#         self.scaler = StandardScaler()
+#         # Updated to include 'none' and match your dataset
+#         self.classes = ['none', 'normal', 'high_cpu', 'high_memory', 'high_latency',
+#                        'packet_loss', 'bandwidth_saturation', 'high_errors', 'multiple_issues']
+        
+#     def verify_dataset(self, df):
+#         required_columns = {
+#             'cpu_usage': 'float64',
+#             'memory_usage': 'float64',
+#             'bandwidth_mbps': 'float64',
+#             'latency_ms': 'float64',
+#             'packet_loss_percent': 'float64',
+#             'error_rate_percent': 'float64',
+#             'issue_detected': 'object'
+#         }
+        
+#         for col, dtype in required_columns.items():
+#             if col not in df.columns:
+#                 raise ValueError(f"Missing column: {col}")
+#             if df[col].dtype != dtype:
+#                 raise ValueError(f"Column {col} has wrong dtype. Expected {dtype}, got {df[col].dtype}")
+        
+#         # Additional check for labels
+#         unique_labels = df['issue_detected'].unique()
+#         for label in unique_labels:
+#             if label not in self.classes:
+#                 raise ValueError(f"Label '{label}' not in model's classes list")
+        
+#         print("Dataset validation passed!")
+
+#     def build_model(self):
+#         model = Sequential([
+#             Dense(64, activation='relu', input_dim=6),
+#             Dense(32, activation='relu'),
+#             Dense(len(self.classes), activation='softmax')  # Now matches all possible labels
+#         ])
+#         model.compile(optimizer=Adam(0.001),
+#                     loss='sparse_categorical_crossentropy',
+#                     metrics=['accuracy'])
+#         return model
+
+#     def train(self, data_path='network_performance_dataset.csv'):
+#         df = pd.read_csv(data_path)
+#         self.verify_dataset(df)
+        
+#         X = df[['cpu_usage', 'memory_usage', 'bandwidth_mbps',
+#                 'latency_ms', 'packet_loss_percent', 'error_rate_percent']]
+#         y = df['issue_detected'].apply(lambda x: self.classes.index(x))
+        
+#         X = self.scaler.fit_transform(X)
+#         self.model = self.build_model()
+#         self.model.fit(X, y, epochs=20, batch_size=32, validation_split=0.2)
+        
+#         dump({'model': self.model, 'scaler': self.scaler, 'classes': self.classes}, 
+#              'network_ai.joblib')
+#         print(f"Model trained and saved! Classes: {self.classes}")
+
+# if __name__ == "__main__":
+#     monitor = AINetworkMonitor()
+#     monitor.train()
+
+
+import os
+import pandas as pd
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import Dense, Lambda
+from tensorflow.keras.optimizers import Adam
+from joblib import dump, load
+import tensorflow as tf
+from dataset_schema import FEATURE_COLUMNS, LABEL_COLUMN, CLASSES
+from feature_store import FeatureStore, encode_labels, open_feature_store
+
+# Streaming training
+STREAM_CHUNK_ROWS = 200_000  # Rows held in memory at once
+VALIDATION_EVERY = 5         # Every 5th row is held out, matching validation_split=0.2
+CHECKPOINT_EVERY_STEPS = 1000
+
+class QuantumInspiredMonitor:
+    def __init__(self):
+        self.scaler = StandardScaler()
+        self.classes = list(CLASSES)
+    
+    def _quantum_inspired_layer(self, x):
+        """Classical approximation of quantum operations"""
+        # Quantum-inspired rotation (using classical trigonometry)
+        sin_trans = tf.math.sin(x * np.pi)  # Simulates quantum rotations
+        cos_trans = tf.math.cos(x * np.pi)
+        
+        # Entanglement simulation (non-linear mixing)
+        entangled = tf.multiply(sin_trans, cos_trans)
+        return entangled
+    
+    def build_model(self):
+        model = Sequential([
+            # Classical input
+            Dense(64, activation='relu', input_dim=len(FEATURE_COLUMNS)),
+            
+            # Quantum-inspired transformations
+            Lambda(self._quantum_inspired_layer),
+            Dense(32, activation='relu'),
+            
+            # Output with quantum-inspired interference
+            Dense(len(self.classes), 
+                  activation=lambda x: tf.math.abs(x)  # Probability-like output
+            )
+        ])
+        
+        model.compile(
+            optimizer=Adam(0.001),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        return model
+
+    def load_training_data(self, data_path):
+        """Load features and label codes from a feature store directory or a CSV"""
+        if os.path.isdir(data_path):
+            store = FeatureStore(data_path)
+            return store.features(), np.asarray(store.labels)
+        df = pd.read_csv(data_path, usecols=FEATURE_COLUMNS + [LABEL_COLUMN])
+        return df[FEATURE_COLUMNS].to_numpy(), encode_labels(df[LABEL_COLUMN].to_numpy())
+
+    def train(self, data_path):
+        X, y = self.load_training_data(data_path)
+        
+        X = self.scaler.fit_transform(X)
+        self.model = self.build_model()
+        
+        self.model.fit(X, y, epochs=50, batch_size=32, validation_split=0.2)
+        
+        dump({
+            'model': self.model,
+            'scaler': self.scaler,
+            'classes': self.classes
+        }, 'quantum_inspired_network.joblib')
+        
+        print("Quantum-inspired (classical) model trained and saved!")
+
+    def iter_chunks(self, data_path, chunksize=STREAM_CHUNK_ROWS):
+        """Yield (features, label codes) chunks from a feature store directory or a CSV"""
+        if os.path.isdir(data_path):
+            yield from FeatureStore(data_path).iter_batches(chunksize)
+            return
+        for df in pd.read_csv(data_path, usecols=FEATURE_COLUMNS + [LABEL_COLUMN], chunksize=chunksize):
+            yield df[FEATURE_COLUMNS].to_numpy(), encode_labels(df[LABEL_COLUMN].to_numpy())
+
+    def _stream_dataset(self, data_path, batch_size, chunksize, validation):
+        """tf.data pipeline that scales and batches one chunk at a time, with prefetching"""
+        def batches():
+            offset = 0
+            for X, y in self.iter_chunks(data_path, chunksize):
+                held_out = (offset + np.arange(len(X))) % VALIDATION_EVERY == 0
+                offset += len(X)
+                keep = held_out if validation else ~held_out
+                X = self.scaler.transform(X[keep]).astype(np.float32)
+                y = np.asarray(y[keep], dtype=np.int32)
+                if not validation:
+                    order = np.random.permutation(len(X))
+                    X, y = X[order], y[order]
+                for start in range(0, len(X), batch_size):
+                    yield X[start:start + batch_size], y[start:start + batch_size]
+
+        return tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None, len(FEATURE_COLUMNS)), dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.int32)
+            )
+        ).prefetch(tf.data.AUTOTUNE)
+
+    def train_streaming(self, data_path, epochs=50, batch_size=32, chunksize=STREAM_CHUNK_ROWS,
+                        checkpoint_dir='training_checkpoints'):
+        """Out-of-core training: peak memory is bounded by chunksize, not the dataset size
+
+        Re-running after an interruption resumes from the last checkpoint in checkpoint_dir.
+        """
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        scaler_path = os.path.join(checkpoint_dir, 'scaler.joblib')
+        
+        # Pass 1: fit the scaler incrementally, unless a resumed run already did
+        if os.path.exists(scaler_path):
+            self.scaler = load(scaler_path)
+        else:
+            self.scaler = StandardScaler()
+            for X, _ in self.iter_chunks(data_path, chunksize):
+                self.scaler.partial_fit(X)
+            dump(self.scaler, scaler_path)
+        
+        # Pass 2: stream batches into the model, checkpointing as it goes
+        self.model = self.build_model()
+        self.model.fit(
+            self._stream_dataset(data_path, batch_size, chunksize, validation=False),
+            validation_data=self._stream_dataset(data_path, batch_size, chunksize, validation=True),
+            epochs=epochs,
+            callbacks=[tf.keras.callbacks.BackupAndRestore(
+                backup_dir=os.path.join(checkpoint_dir, 'backup'),
+                save_freq=CHECKPOINT_EVERY_STEPS
+            )]
+        )
+        
+        dump({
+            'model': self.model,
+            'scaler': self.scaler,
+            'classes': self.classes
+        }, 'quantum_inspired_network.joblib')
+        os.remove(scaler_path)
+        
+        print("Quantum-inspired (classical) model trained with streaming and saved!")
+
+if __name__ == "__main__":
+    monitor = QuantumInspiredMonitor()
+    # Parse the CSV once; later runs open the memory-mapped store directly
+    store = open_feature_store('network_performance_dataset.store', csv_path='network_performance_dataset.csv')
+    monitor.train(store.store_dir)
\ No newline at end of file
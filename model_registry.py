@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+import time
+import numpy as np
+from joblib import load
+from dataset_schema import FEATURE_COLUMNS, CLASSES
+from numpy_model import load_numpy_model
+
+MODEL_DIRS = ['model', '.']  # Searched in order; model.py saves into the working directory
+# <name>[-v<version>].<npz|joblib>, e.g. network_ai.joblib or quantum_inspired_network-v3.npz
+ARTIFACT_PATTERN = re.compile(r'^(?P<name>network_ai|quantum_inspired_network)(?:-v?(?P<version>[\w.]+))?'
+                              r'\.(?P<format>npz|joblib)$')
+RELOAD_INTERVAL = 30  # Seconds between scans for new artifacts; 0 disables watching
+
+
+class ModelVersion:
+    def __init__(self, path, name, version, format):
+        self.path = path
+        self.name = name
+        self.version = version
+        self.format = format
+        self.mtime = os.path.getmtime(path)
+
+    @property
+    def key(self):
+        return (os.path.abspath(self.path), self.mtime)
+
+    def to_dict(self):
+        return {'path': self.path, 'name': self.name, 'version': self.version,
+                'format': self.format, 'modified': self.mtime}
+
+
+def discover(dirs=MODEL_DIRS):
+    """Model artifacts on disk, preferred first: newest, and the TensorFlow-free export on ties"""
+    found = {}
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            match = ARTIFACT_PATTERN.match(filename)
+            if match:
+                version = ModelVersion(os.path.join(directory, filename), match['name'],
+                                       match['version'], match['format'])
+                found.setdefault(version.key, version)
+    return sorted(found.values(), key=lambda v: (-v.mtime, v.format != 'npz'))
+
+
+def load_artifact(path):
+    return load_numpy_model(path) if path.endswith('.npz') else load(path)
+
+
+def validate(model_data):
+    """Check an artifact against the features and classes QuantumInspiredMonitor is built with"""
+    classes = [str(c) for c in model_data.get('classes', [])]
+    if classes != CLASSES:
+        raise ValueError(f"Model classes {classes} do not match {CLASSES}")
+    probe = model_data['scaler'].transform(np.zeros((1, len(FEATURE_COLUMNS))))
+    output = np.asarray(model_data['model'].predict(probe, batch_size=1, verbose=0))
+    if output.shape != (1, len(CLASSES)):
+        raise ValueError(f"Model maps {len(FEATURE_COLUMNS)} features to shape {output.shape}, "
+                         f"expected (1, {len(CLASSES)})")
+
+
+def top_confidence(pred):
+    """Top class's share of each row's outputs; the monitors' abs outputs aren't probabilities"""
+    pred = np.maximum(np.asarray(pred, dtype=np.float64), 0)
+    total = pred.sum(axis=1)
+    return np.divide(pred.max(axis=1), total, out=np.zeros(len(pred)), where=total > 0)
+
+
+class ModelRegistry:
+    """Loads the best valid artifact off the request path and hot-swaps newer ones as they appear
+
+    Readers take `current` once per use; the swap replaces the reference, so a tick that
+    already holds the old model finishes with it.
+    """
+    def __init__(self, dirs=MODEL_DIRS, interval=RELOAD_INTERVAL):
+        self.dirs = dirs
+        self.interval = interval
+        self.current = None
+        self.active = None
+        self.status = 'empty'
+        self.errors = {}      # path -> why the artifact was rejected
+        self.rejected = set() # keys of artifacts that failed, retried only once they change
+        self.loaded_at = None
+        self.pinned = None    # Path chosen through activate(), overriding the preference order
+        self.listeners = []   # Called with each validated model before it goes live
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        """Load in the background and, with an interval, keep watching for new artifacts"""
+        if self.thread is None:
+            self.status = 'loading'
+            self.thread = threading.Thread(target=self._run, name='model-registry', daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self._safe_refresh()
+            if not self.interval:
+                break
+            time.sleep(self.interval)
+
+    def activate(self, path=None):
+        """Pin one artifact (None returns to the newest valid one) and load it in the background"""
+        self.pinned = path
+        self.reload()
+
+    def reload(self):
+        threading.Thread(target=self._safe_refresh, name='model-reload', daemon=True).start()
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # e.g. an artifact deleted mid-scan; log it and let the watcher keep going
+            print(f"Model registry error: {str(e)}")
+
+    def refresh(self):
+        """Swap in the most preferred valid artifact; returns True on a swap"""
+        with self.lock:
+            candidates = discover(self.dirs)
+            pinned = self.pinned
+            if pinned is not None:
+                candidates = [v for v in candidates if os.path.abspath(v.path) == os.path.abspath(pinned)]
+                if not candidates:
+                    self.errors[pinned] = 'not found'
+                    return False
+            for version in candidates:
+                if self.active is not None and version.key == self.active.key:
+                    return False
+                if version.key in self.rejected:
+                    continue
+                try:
+                    start = time.perf_counter()
+                    model_data = load_artifact(version.path)
+                    validate(model_data)
+                except Exception as e:
+                    self.rejected.add(version.key)
+                    self.errors[version.path] = str(e)
+                    print(f"Skipping model {version.path}: {str(e)}")
+                    continue
+                self.errors.pop(version.path, None)
+                # Derived state (e.g. drift references) is prepared here, off the monitor tick
+                for listener in self.listeners:
+                    try:
+                        listener(model_data)
+                    except Exception as e:
+                        print(f"Model listener error: {str(e)}")
+                self.current, self.active = model_data, version
+                self.loaded_at = time.time()
+                self.status = 'ready'
+                print(f"AI model {version.path} loaded in {time.perf_counter() - start:.2f}s")
+                return True
+            if self.current is None:
+                self.status = 'failed' if candidates else 'empty'
+            return False
+
+    def describe(self):
+        return {
+            'status': self.status,
+            'active': self.active.to_dict() if self.active else None,
+            'loaded_at': self.loaded_at,
+            'available': [v.to_dict() for v in discover(self.dirs)],
+            'errors': dict(self.errors)
+        }
@@ -0,0 +1,179 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from dataset_schema import FEATURE_COLUMNS
+
+# Candidate elementwise functions used to identify Keras activations and Lambda layers
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'abs': np.abs,
+    'quantum': lambda x: np.sin(x * np.pi) * np.cos(x * np.pi),
+}
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _identify(fn, allow_softmax=False):
+    """Match a Keras callable against the known NumPy functions by probing it"""
+    # Random points: a regular grid hits the zeros of sin(pi x) cos(pi x) and can't tell it from 0
+    probe = np.random.default_rng(0).uniform(-2, 2, (1, 16)).astype(np.float32)
+    out = np.asarray(fn(probe))
+    for name, ref in ACTIVATIONS.items():
+        if np.allclose(out, ref(probe), atol=1e-5):
+            return name
+    if allow_softmax and np.allclose(out, _softmax(probe), atol=1e-5):
+        return 'softmax'
+    raise ValueError(f"Unsupported layer function: {fn}")
+
+
+def export_model(joblib_path, npz_path):
+    """Export a trained Keras monitor and its scaler to a TensorFlow-free .npz artifact"""
+    from joblib import load
+    model_data = load(joblib_path)
+
+    arrays = {}
+    layers = []
+    for layer in model_data['model'].layers:
+        kind = layer.__class__.__name__
+        if kind == 'Dense':
+            W, b = layer.get_weights()
+            arrays[f'W{len(layers)}'] = W.astype(np.float32)
+            arrays[f'b{len(layers)}'] = b.astype(np.float32)
+            layers.append('dense:' + _identify(layer.activation, allow_softmax=True))
+        elif kind == 'Lambda':
+            layers.append('lambda:' + _identify(layer))
+        else:
+            raise ValueError(f"Unsupported layer type: {kind}")
+
+    scaler = model_data['scaler']
+    np.savez_compressed(
+        npz_path,
+        layers=np.array(layers),
+        classes=np.array(model_data['classes']),
+        scaler_mean=scaler.mean_.astype(np.float32),
+        scaler_scale=scaler.scale_.astype(np.float32),
+        **arrays
+    )
+    print(f"Exported {len(layers)} layers from {joblib_path} to {npz_path}")
+    return npz_path
+
+
+class NumpyScaler:
+    """Drop-in replacement for a fitted StandardScaler's transform"""
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float32) - self.mean_) / self.scale_
+
+
+class NumpyMonitorModel:
+    """Pure NumPy forward pass over the layers exported by export_model"""
+    def __init__(self, layers, weights):
+        self.layers = layers
+        self.weights = weights
+
+    def predict(self, X, batch_size=None, verbose=0):
+        h = np.asarray(X, dtype=np.float32)
+        for i, spec in enumerate(self.layers):
+            kind, fn = spec.split(':')
+            if kind == 'dense':
+                W, b = self.weights[i]
+                h = h @ W + b
+            h = _softmax(h) if fn == 'softmax' else ACTIVATIONS[fn](h)
+        return h
+
+
+def load_numpy_model(npz_path):
+    """Load an exported artifact as a model_data dict compatible with the joblib bundles"""
+    with np.load(npz_path) as data:
+        layers = [str(spec) for spec in data['layers']]
+        weights = {i: (data[f'W{i}'], data[f'b{i}'])
+                   for i, spec in enumerate(layers) if spec.startswith('dense:')}
+        return {
+            'model': NumpyMonitorModel(layers, weights),
+            'scaler': NumpyScaler(data['scaler_mean'], data['scaler_scale']),
+            'classes': [str(c) for c in data['classes']]
+        }
+
+
+def _measure_startup(code):
+    """Time a fresh interpreter running code and report its peak RSS in MB"""
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, '-c', code + '\nimport resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)'],
+        capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, int(out.stdout.strip().splitlines()[-1]) / 1024
+
+
+def _measure_latency(predict, X, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def compare(joblib_path, npz_path, data_path, rows):
+    """Check prediction parity and compare startup and latency of both inference paths"""
+    import pandas as pd
+    from joblib import load
+
+    X = pd.read_csv(data_path, nrows=rows)[FEATURE_COLUMNS].to_numpy()
+    keras_data = load(joblib_path)
+    numpy_data = load_numpy_model(npz_path)
+
+    def keras_predict(batch):
+        scaled = keras_data['scaler'].transform(batch)
+        return keras_data['model'].predict(scaled, batch_size=len(batch), verbose=0)
+
+    def numpy_predict(batch):
+        return numpy_data['model'].predict(numpy_data['scaler'].transform(batch))
+
+    expected = keras_predict(X)
+    actual = numpy_predict(X)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1)))
+    print(f"Parity on {len(X)} rows: max abs diff {max_diff:.2e}, class agreement {agreement:.2%}")
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    keras_time, keras_rss = _measure_startup(f"from joblib import load; load({joblib_path!r})")
+    numpy_time, numpy_rss = _measure_startup(
+        f"import sys; sys.path.insert(0, {here!r}); import numpy_model; numpy_model.load_numpy_model({npz_path!r})"
+    )
+    print(f"Startup: keras {keras_time:.2f}s / {keras_rss:.0f} MB, numpy {numpy_time:.2f}s / {numpy_rss:.0f} MB")
+
+    for label, batch in (('1 row', X[:1]), (f'{len(X)} rows', X)):
+        print(f"Latency ({label}): keras {_measure_latency(keras_predict, batch):.3f} ms, "
+              f"numpy {_measure_latency(numpy_predict, batch):.3f} ms")
+
+    if agreement < 1.0 or max_diff > 1e-4:
+        raise SystemExit("Parity check failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and check TensorFlow-free monitor models")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_cmd = sub.add_parser('export')
+    export_cmd.add_argument('joblib_path')
+    export_cmd.add_argument('npz_path')
+    compare_cmd = sub.add_parser('compare')
+    compare_cmd.add_argument('joblib_path')
+    compare_cmd.add_argument('npz_path')
+    compare_cmd.add_argument('--data', default='network_performance_dataset.csv')
+    compare_cmd.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_model(args.joblib_path, args.npz_path)
+    else:
+        compare(args.joblib_path, args.npz_path, args.data, args.rows)
@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Bucket width per feature (cpu, memory, bandwidth, latency, packet_loss, errors): readings
+# within one bucket share a prediction, which is made on the bucket centre
+BUCKET_WIDTHS = [1.0, 1.0, 10.0, 1.0, 0.1, 0.1]
+MAX_ENTRIES = 100_000
+
+
+class PredictionCache:
+    """LRU of (label, confidence) keyed on quantized feature vectors"""
+    def __init__(self, bucket_widths=BUCKET_WIDTHS, max_entries=MAX_ENTRIES):
+        self.widths = np.asarray(bucket_widths, dtype=float)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.model = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def quantize(self, features):
+        return np.round(np.asarray(features, dtype=float) / self.widths).astype(np.int64)
+
+    def predict(self, features, score, model=None):
+        """Labels and confidences for a feature matrix, calling score(matrix) only for unseen buckets
+
+        Passing the loaded model lets the cache drop everything when it is replaced.
+        """
+        buckets = self.quantize(features)
+        keys = [row.tobytes() for row in buckets]
+        labels = np.empty(len(keys), dtype=object)
+        confidence = np.empty(len(keys))
+
+        with self.lock:
+            if model is not self.model:
+                self.entries.clear()
+                self.model = model
+            missing = {}
+            for i, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self.entries.move_to_end(key)
+                    labels[i], confidence[i] = entry
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Score each unseen bucket once, at its centre, so results don't depend on arrival order
+            first = [rows[0] for rows in missing.values()]
+            new_labels, new_confidence = score(buckets[first] * self.widths)
+            with self.lock:
+                for (key, rows), label, p in zip(missing.items(), new_labels, new_confidence):
+                    labels[rows] = label
+                    confidence[rows] = p
+                    self.entries[key] = (label, float(p))
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return labels, confidence
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
@@ -0,0 +1,134 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+REMEDIATION_WORKERS = 4
+MAX_FINISHED_JOBS = 1000
+
+# Per action type: at most `burst` jobs at once, refilled at `per_minute`
+RATE_LIMITS = {
+    'device_down': {'burst': 5, 'per_minute': 10},
+    'high_cpu': {'burst': 2, 'per_minute': 4},
+    'high_latency': {'burst': 2, 'per_minute': 4},
+}
+DEFAULT_RATE_LIMIT = {'burst': 2, 'per_minute': 4}
+
+
+class TokenBucket:
+    def __init__(self, burst, per_minute):
+        self.capacity = burst
+        self.tokens = burst
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RemediationJob:
+    def __init__(self, alert_type, device, project_id=None):
+        self.id = uuid.uuid4().hex
+        self.alert_type = alert_type
+        self.device = device
+        self.project_id = project_id
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed', 'rate_limited')
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'alert_type': self.alert_type,
+            'device': self.device,
+            'project_id': self.project_id,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+
+class RemediationQueue:
+    """Runs remediation actions off the request path on a bounded worker pool"""
+    def __init__(self, handler, on_complete=None, max_workers=REMEDIATION_WORKERS, rate_limits=RATE_LIMITS):
+        self.handler = handler          # handler(alert_type, device) -> result dict
+        self.on_complete = on_complete  # on_complete(job), e.g. a Socket.IO notification
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='remediation')
+        self.rate_limits = rate_limits
+        self.buckets = {}
+        self.jobs = OrderedDict()
+        self.in_progress = {}  # (alert_type, device, project) -> job, so repeated clicks share one job
+        self.lock = threading.Lock()
+
+    def submit(self, alert_type, device=None, project_id=None):
+        """Queue a remediation and return its job immediately"""
+        key = (alert_type, device, project_id)
+        with self.lock:
+            existing = self.in_progress.get(key)
+            if existing is not None:
+                return existing
+
+            job = RemediationJob(alert_type, device, project_id)
+            self.jobs[job.id] = job
+            self._evict()
+            bucket = self.buckets.get(alert_type)
+            if bucket is None:
+                bucket = self.buckets[alert_type] = TokenBucket(**self.rate_limits.get(alert_type, DEFAULT_RATE_LIMIT))
+            if not bucket.take():
+                job.status = 'rate_limited'
+                job.finished = time.time()
+                return job
+            self.in_progress[key] = job
+
+        self.pool.submit(self._run, job, key)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.in_progress)
+
+    def _run(self, job, key):
+        job.status = 'running'
+        job.started = time.time()
+        try:
+            job.result = self.handler(job.alert_type, job.device)
+            job.status = 'succeeded'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished = time.time()
+
+        with self.lock:
+            self.in_progress.pop(key, None)
+        if self.on_complete:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                print(f"Remediation notification error: {str(e)}")
+
+    def _evict(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        excess = len(self.jobs) - MAX_FINISHED_JOBS
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.done][:max(excess, 0)]:
+            del self.jobs[job_id]
@@ -0,0 +1,125 @@
+import heapq
+import threading
+import time
+
+FAST_INTERVAL = 3            # Seconds between polls of anomalous, uncertain or alerting devices
+MAX_INTERVAL = 60            # Longest gap for a device that has stayed healthy
+BACKOFF = 2                  # Interval multiplier per consecutive healthy poll
+UNCERTAIN_CONFIDENCE = 0.6   # Top class share of the model outputs below this counts as uncertain
+MAX_POLLS_PER_SECOND = 200   # Global cap on device polls across every scheduler sharing a budget
+HEALTHY_CLASSES = ('none', 'normal')
+
+
+class PollBudget:
+    """Token bucket of device polls, shared by the schedulers of all watched projects"""
+    def __init__(self, max_per_second=MAX_POLLS_PER_SECOND):
+        self.max_per_second = max_per_second
+        self.allowance = max_per_second
+        self.updated = None
+        self.lock = threading.Lock()  # Projects are collected concurrently
+
+    def _refill(self, now):
+        if self.updated is None or now > self.updated:
+            # Budget accrues between ticks but never banks more than one tick's worth
+            elapsed = 0 if self.updated is None else now - self.updated
+            self.allowance = min(self.allowance + elapsed * self.max_per_second,
+                                 max(elapsed, 1) * self.max_per_second)
+            self.updated = now
+
+    def available(self, now):
+        with self.lock:
+            self._refill(now)
+            return int(self.allowance)
+
+    def take(self, wanted, now):
+        """Grant up to wanted polls at time now; returns how many were granted"""
+        with self.lock:
+            self._refill(now)
+            granted = min(wanted, int(self.allowance))
+            self.allowance -= granted
+            return granted
+
+
+class PollScheduler:
+    """Per-device poll intervals kept in a heap ordered by next due time"""
+    def __init__(self, fast_interval=FAST_INTERVAL, max_interval=MAX_INTERVAL,
+                 max_per_second=MAX_POLLS_PER_SECOND, budget=None):
+        self.fast_interval = fast_interval
+        self.max_interval = max_interval
+        self.budget = budget or PollBudget(max_per_second)
+        self.heap = []        # (due, device); stale entries are skipped when popped
+        self.due_at = {}      # device -> current due time
+        self.interval = {}    # device -> current poll interval
+        self.taken = {}       # device -> when due() last handed it out
+        self.polls = 0
+
+    def sync(self, device_names, now=None):
+        """Track new devices (due immediately), drop vanished ones and recover lost polls"""
+        now = time.time() if now is None else now
+        names = set(device_names)
+        for name in [n for n in self.due_at if n not in names]:
+            del self.due_at[name]
+            del self.interval[name]
+            self.taken.pop(name, None)
+        for name in device_names:
+            if name not in self.due_at:
+                self.interval[name] = self.fast_interval
+                self._schedule(name, now)
+            elif self.due_at[name] is None and now - self.taken[name] > self.interval[name]:
+                # Handed out but never rescheduled, e.g. the tick failed halfway
+                self._schedule(name, now)
+        if len(self.heap) > 2 * len(self.due_at) + 64:
+            self.heap = [(due, name) for name, due in self.due_at.items()]
+            heapq.heapify(self.heap)
+
+    def _schedule(self, name, due):
+        self.due_at[name] = due
+        heapq.heappush(self.heap, (due, name))
+
+    def due(self, now=None, limit=None):
+        """Pop the devices due by now, oldest first, within the requests-per-second budget
+        and at most limit of them"""
+        now = time.time() if now is None else now
+        available = self.budget.available(now)
+        limit = available if limit is None else min(limit, available)
+        ready = []
+        while self.heap and self.heap[0][0] <= now and len(ready) < limit:
+            when, name = heapq.heappop(self.heap)
+            if self.due_at.get(name) == when:
+                ready.append((when, name))
+        granted = self.budget.take(len(ready), now)
+        # Devices another project's scheduler got to first stay queued with their due time
+        for entry in ready[granted:]:
+            heapq.heappush(self.heap, entry)
+
+        due = [name for _, name in ready[:granted]]
+        for name in due:
+            self.due_at[name] = None
+            self.taken[name] = now
+        self.polls += len(due)
+        return due
+
+    def retry(self, name, now=None):
+        """Poll a device again after the fast interval, keeping its current interval"""
+        if name in self.interval:
+            now = time.time() if now is None else now
+            self._schedule(name, now + self.fast_interval)
+
+    def reschedule(self, name, prediction=None, confidence=None, alerting=False, now=None):
+        """Set the next poll of a device from the outcome of the one just taken
+
+        A device without a prediction (no model loaded yet, or scoring failed) counts as
+        suspicious: nothing says it is healthy, so it isn't backed off.
+        """
+        if name not in self.interval:
+            return
+        now = time.time() if now is None else now
+        suspicious = (alerting
+                      or prediction is None
+                      or prediction not in HEALTHY_CLASSES
+                      or (confidence is not None and confidence < UNCERTAIN_CONFIDENCE))
+        if suspicious:
+            self.interval[name] = self.fast_interval
+        else:
+            self.interval[name] = min(self.interval[name] * BACKOFF, self.max_interval)
+        self._schedule(name, now + self.interval[name])
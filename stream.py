@@ -0,0 +1,191 @@
+import threading
+import time
+
+VALUE_PRECISION = 2  # Decimals kept for metrics so noise below this doesn't count as a change
+ACK_TIMEOUT = 10     # Seconds before an unacknowledged client is resynced with a snapshot
+
+
+def _alert_key(alert):
+    return f"{alert['type']}:{alert.get('device', '')}"
+
+
+def _round(value):
+    return round(value, VALUE_PRECISION) if isinstance(value, float) else value
+
+
+class DeltaEncoder:
+    """Tracks the last published state of one project and diffs each tick against it"""
+    def __init__(self):
+        self.seq = 0
+        self.devices = {}
+        self.alerts = {}
+        self.summary = {}
+
+    def snapshot(self):
+        return {
+            'seq': self.seq,
+            'summary': dict(self.summary),
+            'devices': list(self.devices.values()),
+            'alerts': list(self.alerts.values())
+        }
+
+    def update(self, stats):
+        """Apply a full stats dict and return the delta against the previous state"""
+        delta = {'devices': {}, 'removed_devices': [], 'alerts_raised': [], 'alerts_updated': [],
+                 'alerts_cleared': []}
+
+        summary = {k: _round(v) for k, v in stats.items() if k not in ('devices', 'alerts')}
+        delta['summary'] = {k: v for k, v in summary.items() if self.summary.get(k) != v}
+        self.summary = summary
+
+        devices = {}
+        for device in stats.get('devices', []):
+            device = {k: _round(v) for k, v in device.items()}
+            previous = self.devices.get(device['name'], {})
+            changed = {k: v for k, v in device.items() if previous.get(k) != v}
+            if changed:
+                changed['name'] = device['name']
+                delta['devices'][device['name']] = changed
+            devices[device['name']] = device
+        delta['removed_devices'] = [name for name in self.devices if name not in devices]
+        self.devices = devices
+
+        alerts = {_alert_key(a): a for a in stats.get('alerts', [])}
+        # Alerts whose details changed (e.g. more impacted devices) are re-sent as raised
+        delta['alerts_raised'] = [a for key, a in alerts.items() if self.alerts.get(key) != a]
+        # Keys among them that the client already holds
+        delta['alerts_updated'] = [_alert_key(a) for a in delta['alerts_raised'] if _alert_key(a) in self.alerts]
+        delta['alerts_cleared'] = [key for key in self.alerts if key not in alerts]
+        self.alerts = alerts
+
+        self.seq += 1
+        delta['seq'] = self.seq
+        return delta
+
+
+def merge_deltas(pending, delta):
+    """Coalesce a newer delta into one that has not been delivered yet"""
+    merged = {
+        'seq': delta['seq'],
+        'summary': {**pending['summary'], **delta['summary']},
+        'devices': {name: dict(changed) for name, changed in pending['devices'].items()},
+        'removed_devices': list(pending['removed_devices'])
+    }
+
+    for name in delta['removed_devices']:
+        merged['devices'].pop(name, None)
+        if name not in merged['removed_devices']:
+            merged['removed_devices'].append(name)
+    for name, changed in delta['devices'].items():
+        if name in merged['removed_devices']:
+            merged['removed_devices'].remove(name)
+        merged['devices'].setdefault(name, {}).update(changed)
+
+    raised = {_alert_key(a): a for a in pending['alerts_raised']}
+    updated = set(pending['alerts_updated'])  # Raised keys the client already holds
+    cleared = set(pending['alerts_cleared'])
+    for key in delta['alerts_cleared']:
+        # An alert raised and cleared before delivery never reaches the client,
+        # but one it already holds still has to be cleared there
+        if raised.pop(key, None) is None or key in updated:
+            cleared.add(key)
+        updated.discard(key)
+    for alert in delta['alerts_raised']:
+        key = _alert_key(alert)
+        if key in cleared or key in delta['alerts_updated']:
+            updated.add(key)
+        cleared.discard(key)
+        raised[key] = alert
+    merged['alerts_raised'] = list(raised.values())
+    merged['alerts_updated'] = [key for key in raised if key in updated]
+    merged['alerts_cleared'] = list(cleared)
+    return merged
+
+
+class ClientStream:
+    """Per-client delivery state: one update in flight, later ones coalesced"""
+    def __init__(self, sid, project_id):
+        self.sid = sid
+        self.project_id = project_id
+        self.needs_snapshot = True
+        self.pending = None
+        self.in_flight_since = None
+        self.last_sent = 0
+
+
+class StreamHub:
+    """Fans project updates out to dashboards as a snapshot followed by deltas"""
+    def __init__(self, emit, min_interval=1.0):
+        self.emit = emit  # emit(event, payload, sid, callback)
+        self.min_interval = min_interval
+        self.encoders = {}
+        self.clients = {}
+        self.lock = threading.RLock()
+
+    def join(self, sid, project_id):
+        with self.lock:
+            self.clients[sid] = client = ClientStream(sid, project_id)
+            self._flush(client)
+
+    def leave(self, sid):
+        with self.lock:
+            self.clients.pop(sid, None)
+
+    def publish(self, project_id, stats):
+        """Diff a project's new stats once and queue the delta for each of its clients"""
+        with self.lock:
+            encoder = self.encoders.setdefault(project_id, DeltaEncoder())
+            delta = encoder.update(stats)
+            for client in self.clients.values():
+                if client.project_id != project_id or client.needs_snapshot:
+                    continue
+                if client.pending is None:
+                    client.pending = delta
+                else:
+                    client.pending = merge_deltas(client.pending, delta)
+            for client in list(self.clients.values()):
+                if client.project_id == project_id:
+                    self._flush(client)
+
+    def pending_count(self):
+        """Clients with an update waiting behind an unacknowledged one"""
+        with self.lock:
+            return sum(1 for client in self.clients.values() if client.pending is not None)
+
+    def forget_project(self, project_id):
+        with self.lock:
+            self.encoders.pop(project_id, None)
+
+    def _flush(self, client):
+        now = time.time()
+        if client.in_flight_since is not None:
+            if now - client.in_flight_since < ACK_TIMEOUT:
+                return
+            # The client never acknowledged; resync it from scratch
+            client.needs_snapshot = True
+        if now - client.last_sent < self.min_interval:
+            return
+
+        encoder = self.encoders.get(client.project_id)
+        if client.needs_snapshot:
+            if encoder is None or encoder.seq == 0:
+                return
+            event, payload = 'snapshot', encoder.snapshot()
+            client.needs_snapshot = False
+            client.pending = None
+        elif client.pending is not None:
+            event, payload = 'delta', client.pending
+            client.pending = None
+        else:
+            return
+
+        client.in_flight_since = now
+        client.last_sent = now
+        self.emit(event, payload, client.sid, lambda *args: self._acknowledge(client.sid))
+
+    def _acknowledge(self, sid):
+        with self.lock:
+            client = self.clients.get(sid)
+            if client is not None:
+                client.in_flight_since = None
+                self._flush(client)
@@ -0,0 +1,207 @@
+import argparse
+import threading
+import time
+import zlib
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+from collectors import Collector, register_collector
+from dataset_schema import FEATURE_COLUMNS, LABEL_COLUMN
+
+DATA_PATH = 'network_performance_dataset.csv'
+NUMERIC_COLUMNS = FEATURE_COLUMNS + ['tcp_connections', 'udp_connections', 'disk_io_percent', 'temperature_c']
+INTEGER_COLUMNS = ['tcp_connections', 'udp_connections']
+QUANTILES = 101             # Points of each column's empirical distribution kept per group
+MIN_GROUP_ROWS = 30         # Smaller device_type/issue groups borrow the issue's pooled distribution
+CHUNK_ROWS = 500_000
+INTERVAL = 300              # Seconds between samples of one device, as in the source data
+START = '2024-01-01'
+STICKINESS = 0.95           # Chance a simulated node keeps its issue from one reading to the next
+NODE_DEVICE_TYPES = {'ethernet_switch': 'Switch', 'vpcs': 'Workstation'}
+
+
+class GroupModel:
+    """Gaussian copula of one group: per-column quantiles plus the correlation of their normal scores"""
+    def __init__(self, values):
+        n = len(values)
+        self.quantiles = np.quantile(values, np.linspace(0, 1, QUANTILES), axis=0)
+        ranks = values.argsort(axis=0).argsort(axis=0)
+        scores = ndtri((ranks + 0.5) / n)
+        correlation = np.corrcoef(scores, rowvar=False) if n > 1 else np.eye(values.shape[1])
+        # Constant columns give NaN correlations; treat them as independent
+        correlation = np.nan_to_num(correlation)
+        np.fill_diagonal(correlation, 1.0)
+        self.cholesky = np.linalg.cholesky(correlation + 1e-6 * np.eye(len(correlation)))
+
+    def sample(self, rng, n):
+        u = ndtr(rng.standard_normal((n, self.cholesky.shape[0])) @ self.cholesky.T)
+        grid = np.linspace(0, 1, QUANTILES)
+        return np.column_stack([np.interp(u[:, j], grid, self.quantiles[:, j])
+                                for j in range(self.quantiles.shape[1])])
+
+
+class TelemetryModel:
+    """Per device_type and issue_detected distributions of all numeric telemetry columns"""
+    def __init__(self, df):
+        self.device_types = sorted(df['device_type'].unique())
+        self.issues = sorted(df[LABEL_COLUMN].unique())
+        counts = df.groupby('device_type').size()
+        self.type_probabilities = (counts / counts.sum()).reindex(self.device_types).to_numpy()
+        joint = df.groupby(['device_type', LABEL_COLUMN]).size().unstack(fill_value=0) \
+            .reindex(index=self.device_types, columns=self.issues, fill_value=0)
+        self.issue_probabilities = (joint.to_numpy() / joint.to_numpy().sum(axis=1, keepdims=True))
+
+        pooled = {issue: GroupModel(group[NUMERIC_COLUMNS].to_numpy(dtype=float))
+                  for issue, group in df.groupby(LABEL_COLUMN)}
+        self.groups = {}
+        for (device_type, issue), group in df.groupby(['device_type', LABEL_COLUMN]):
+            if len(group) >= MIN_GROUP_ROWS:
+                self.groups[device_type, issue] = GroupModel(group[NUMERIC_COLUMNS].to_numpy(dtype=float))
+        for device_type in self.device_types:
+            for issue in self.issues:
+                self.groups.setdefault((device_type, issue), pooled[issue])
+
+    @classmethod
+    def from_csv(cls, path=DATA_PATH):
+        return cls(pd.read_csv(path))
+
+    def sample_issues(self, rng, type_codes):
+        """One issue code per row given its device type code"""
+        cumulative = np.cumsum(self.issue_probabilities, axis=1)[type_codes]
+        codes = (rng.random(len(type_codes))[:, None] > cumulative).sum(axis=1)
+        return np.minimum(codes, len(self.issues) - 1)
+
+    def sample_values(self, rng, type_codes, issue_codes):
+        """(n, len(NUMERIC_COLUMNS)) readings, one (type, issue) group at a time"""
+        values = np.empty((len(type_codes), len(NUMERIC_COLUMNS)))
+        keys = type_codes * len(self.issues) + issue_codes
+        for key in np.unique(keys):
+            rows = np.flatnonzero(keys == key)
+            group = self.groups[self.device_types[key // len(self.issues)], self.issues[key % len(self.issues)]]
+            values[rows] = group.sample(rng, len(rows))
+        return values
+
+    def generate(self, rows, devices, seed=None, chunk_rows=CHUNK_ROWS, start=START, interval=INTERVAL):
+        """Yield DataFrames in the source CSV's layout: every device reports once per interval"""
+        rng = np.random.default_rng(seed)
+        device_types = rng.choice(len(self.device_types), size=devices, p=self.type_probabilities)
+        device_ids = np.array([f"DEV-{i + 1:0{max(3, len(str(devices)))}d}" for i in range(devices)], dtype=object)
+        start = pd.Timestamp(start).value // 10 ** 9
+        for first in range(0, rows, chunk_rows):
+            index = np.arange(first, min(first + chunk_rows, rows))
+            device = index % devices
+            type_codes = device_types[device]
+            issue_codes = self.sample_issues(rng, type_codes)
+            values = self.sample_values(rng, type_codes, issue_codes)
+
+            chunk = pd.DataFrame(np.round(values, 2), columns=NUMERIC_COLUMNS)
+            for column in INTEGER_COLUMNS:
+                chunk[column] = chunk[column].round().astype(np.int64)
+            chunk.insert(0, 'timestamp', pd.to_datetime(start + (index // devices) * interval, unit='s'))
+            chunk.insert(1, 'device_id', device_ids[device])
+            chunk.insert(2, 'device_type', np.asarray(self.device_types, dtype=object)[type_codes])
+            chunk[LABEL_COLUMN] = np.asarray(self.issues, dtype=object)[issue_codes]
+            yield chunk
+
+
+def write_csv(model, path, rows, devices, seed=None, chunk_rows=CHUNK_ROWS):
+    start = time.perf_counter()
+    written = 0
+    for i, chunk in enumerate(model.generate(rows, devices, seed, chunk_rows)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        written += len(chunk)
+        print(f"Wrote {written} rows ({written / (time.perf_counter() - start):.0f} rows/s)")
+    return written
+
+
+def write_store(model, store_dir, rows, devices, seed=None, chunk_rows=CHUNK_ROWS):
+    """Generate straight into a memory-mapped feature store, skipping CSV parsing entirely"""
+    from feature_store import StoreWriter
+    writer = StoreWriter(store_dir)
+    start = time.perf_counter()
+    try:
+        for chunk in model.generate(rows, devices, seed, chunk_rows):
+            writer.write(chunk)
+            print(f"Wrote {writer.rows} rows ({writer.rows / (time.perf_counter() - start):.0f} rows/s)")
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close({'generator': 'synthetic_telemetry', 'rows': rows, 'devices': devices, 'seed': seed})
+
+
+@register_collector
+class SyntheticCollector(Collector):
+    """Readings drawn from the learned distributions, with issues that persist across reads"""
+    name = 'synthetic'
+
+    def __init__(self, data_path=DATA_PATH, seed=None, stickiness=STICKINESS):
+        self.model = TelemetryModel.from_csv(data_path)
+        self.rng = np.random.default_rng(seed)
+        self.stickiness = stickiness
+        self.state = {}  # node name -> (device type code, issue code)
+        self.lock = threading.Lock()  # Generator objects aren't thread-safe
+        self.columns = [NUMERIC_COLUMNS.index(c) for c in FEATURE_COLUMNS]
+
+    def _device_type(self, node):
+        device_type = NODE_DEVICE_TYPES.get(node.get('node_type'))
+        if device_type in self.model.device_types:
+            return self.model.device_types.index(device_type)
+        # Stable pseudo-random type for anything else, weighted like the source data
+        u = zlib.crc32(node['name'].encode()) / 2 ** 32
+        return int(np.searchsorted(np.cumsum(self.model.type_probabilities), u, side='right'))
+
+    def collect_batch(self, nodes, timeout):
+        with self.lock:
+            return self._sample(nodes)
+
+    def _sample(self, nodes):
+        type_codes = np.empty(len(nodes), dtype=np.int64)
+        previous = np.full(len(nodes), -1)
+        for i, node in enumerate(nodes):
+            state = self.state.get(node['name'])
+            type_codes[i] = state[0] if state else self._device_type(node)
+            previous[i] = state[1] if state else -1
+        issue_codes = self.model.sample_issues(self.rng, type_codes)
+        keep = (previous >= 0) & (self.rng.random(len(nodes)) < self.stickiness)
+        issue_codes[keep] = previous[keep]
+        for node, type_code, issue_code in zip(nodes, type_codes, issue_codes):
+            self.state[node['name']] = (type_code, issue_code)
+        return self.model.sample_values(self.rng, type_codes, issue_codes)[:, self.columns]
+
+    def collect(self, node, timeout):
+        return dict(zip(FEATURE_COLUMNS, self.collect_batch([node], timeout)[0]))
+
+
+def serve_gns3(devices, port, latency):
+    """Fake GNS3 server with one project of the given size, for driving the dashboard at scale"""
+    from fake_gns3 import FakeGNS3Server
+    server = FakeGNS3Server(port=port, latency=latency)
+    project = server.state.add_network(f'Synthetic-{devices}', devices)
+    print(f"Fake GNS3 server on {server.url} with project {project['project_id']} ({devices} devices)")
+    print("Run the app with COLLECTOR = 'synthetic' to feed it readings from the learned distributions")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic network telemetry at scale")
+    parser.add_argument('--data', default=DATA_PATH, help="CSV to learn the distributions from")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('csv', 'store'):
+        cmd = sub.add_parser(name, help=f"Write rows to a {'CSV file' if name == 'csv' else 'feature store'}")
+        cmd.add_argument('output')
+        cmd.add_argument('--rows', type=int, default=1_000_000)
+        cmd.add_argument('--devices', type=int, default=500)
+        cmd.add_argument('--seed', type=int, default=None)
+        cmd.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    gns3_cmd = sub.add_parser('gns3', help="Serve a fake GNS3 project with this many devices")
+    gns3_cmd.add_argument('--devices', type=int, default=1000)
+    gns3_cmd.add_argument('--port', type=int, default=3080)
+    gns3_cmd.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == 'gns3':
+        serve_gns3(args.devices, args.port, args.latency)
+    else:
+        model = TelemetryModel.from_csv(args.data)
+        writer = write_csv if args.command == 'csv' else write_store
+        writer(model, args.output, args.rows, args.devices, args.seed, args.chunk_rows)
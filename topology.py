@@ -0,0 +1,107 @@
+import json
+from collections import deque
+
+ROOT_NAME = "Core-Switch"
+
+
+class TopologyIndex:
+    """Parent/child hierarchy of a project, precomputed once so alert correlation is cheap"""
+    def __init__(self, names, edges, root=ROOT_NAME):
+        adjacency = {name: [] for name in names}
+        for a, b in edges:
+            if a in adjacency and b in adjacency:
+                adjacency[a].append(b)
+                adjacency[b].append(a)
+
+        self.parent = {}
+        self.ancestors = {}   # node -> ancestors, topmost first
+        self.tin = {}
+        self.tout = {}
+        self.order = []
+
+        # One tree per connected component, rooted at the core switch or the best connected node
+        roots = [root] if root in adjacency else []
+        roots += sorted(adjacency, key=lambda n: -len(adjacency[n]))
+        for start in roots:
+            if start not in self.parent:
+                self._walk(start, adjacency)
+
+    def _walk(self, start, adjacency):
+        self.parent[start] = None
+        self.ancestors[start] = ()
+        queue = deque([start])
+        children = {}
+        while queue:
+            node = queue.popleft()
+            children[node] = []
+            for neighbour in adjacency[node]:
+                if neighbour not in self.parent:
+                    self.parent[neighbour] = node
+                    self.ancestors[neighbour] = self.ancestors[node] + (node,)
+                    children[node].append(neighbour)
+                    queue.append(neighbour)
+
+        # Euler tour numbering: b is below a exactly when tin[a] < tin[b] < tout[a]
+        stack = [(start, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                self.tout[node] = len(self.order)
+                continue
+            self.tin[node] = len(self.order)
+            self.order.append(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children[node]))
+
+    @classmethod
+    def from_gns3(cls, nodes, links):
+        """Build from GNS3 /nodes and /links payloads"""
+        names = {node["node_id"]: node["name"] for node in nodes}
+        edges = []
+        for link in links:
+            ends = [names.get(n["node_id"]) for n in link["nodes"]]
+            if len(ends) == 2 and None not in ends:
+                edges.append(tuple(ends))
+        return cls(names.values(), edges)
+
+    @classmethod
+    def load(cls, path):
+        """Build from a topology file written by GNS3NetworkBuilder.save_topology"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["nodes"], [tuple(edge) for edge in data["links"]])
+
+    def is_below(self, ancestor, node):
+        if ancestor not in self.tin or node not in self.tin:
+            return False
+        return self.tin[ancestor] < self.tin[node] < self.tout[ancestor]
+
+    def descendants(self, node):
+        return self.order[self.tin[node] + 1:self.tout[node]] if node in self.tin else []
+
+    def root_cause(self, device, down):
+        """Topmost failed node on the path from the root to device (device itself if none)"""
+        for ancestor in self.ancestors.get(device, ()):
+            if ancestor in down:
+                return ancestor
+        return device
+
+    def collapse(self, alerts):
+        """Fold device_down alerts of nodes behind a failed parent into the parent's alert"""
+        down = {a["device"] for a in alerts if a["type"] == "device_down"}
+        impacted = {}
+        visible = []
+        for alert in alerts:
+            if alert["type"] == "device_down":
+                root = self.root_cause(alert["device"], down)
+                if root != alert["device"]:
+                    impacted.setdefault(root, []).append(alert["device"])
+                    continue
+            visible.append(alert)
+
+        for i, alert in enumerate(visible):
+            if alert["type"] == "device_down" and alert["device"] in impacted:
+                downstream = sorted(impacted[alert["device"]])
+                visible[i] = dict(alert, impacted=downstream,
+                                  message=f"{alert['message']} ({len(downstream)} downstream devices affected)")
+        return visible